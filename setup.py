@@ -54,6 +54,15 @@ setup(
         "reranker": [
             "FlagEmbedding>=1.2.11",
         ],
+        # Optional ONNX Runtime backend for embeddings (embeddings.backend)
+        "onnx": [
+            "sentence-transformers[onnx]==5.1.2",
+        ],
+        # Optional faster JSON serialization and event loop
+        "speedups": [
+            "orjson==3.9.10",
+            "uvloop==0.19.0; sys_platform != 'win32'",
+        ],
         # Dev tooling pinned to match requirements.txt
         "dev": [
             "pytest==7.4.3",
@@ -2,46 +2,153 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Generator, Optional
+from typing import AsyncIterator, Generator, Optional
 
 from fastapi import Depends, FastAPI, HTTPException, Query, Body
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
 
 from ..config import Config
 from ..database import Database
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 config = Config()
 
+# server.py lives at src/second_brain/api/server.py → repo root is parents[3]
+_UI_DIST = Path(__file__).resolve().parents[3] / "web" / "timeline" / "dist"
+
+# Vite emits bundle assets as assets/<name>-<hash>.<ext>; their content never changes
+_HASHED_ASSET_RE = re.compile(r"^assets[\\/].+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Starlette runs sync routes and dependencies on anyio's worker threads
+# (40 by default), so no more read connections than that are ever in use at once
+_DB_POOL_SIZE = 40
+
+# Frames' OCR text never changes once written
+_FRAME_TEXT_CACHE_SIZE = 1024
+
+# The timeline UI is served same-origin (or proxied by the Vite dev server), so
+# only local origins need cross-origin access.
+_DEFAULT_CORS_ORIGINS = [
+    "http://localhost:8000",
+    "http://127.0.0.1:8000",
+    "http://localhost:5173",
+    "http://127.0.0.1:5173",
+]
+
+
+@functools.lru_cache(maxsize=4096)
+def _iso_timestamp(timestamp: int) -> str:
+    """Format a unix timestamp as a local ISO-8601 string.
+
+    Timeline pages request overlapping windows of frames, so the same
+    timestamps are formatted over and over; cache the conversions.
+    """
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+@functools.lru_cache(maxsize=1)
+def _openai_client(api_key: str):
+    """Return a shared OpenAI client so /api/ask reuses pooled connections.
+
+    The SDK retries connection errors, 408/409/429 and 5xx responses with
+    jittered exponential backoff, honoring Retry-After.
+    """
+    from openai import OpenAI
+
+    return OpenAI(
+        api_key=api_key,
+        max_retries=int(config.get("api.openai_max_retries", 3)),
+        timeout=float(config.get("api.openai_timeout_seconds", 120)),
+    )
+
+
+class UIStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache content-hashed bundle assets forever.
+
+    index.html and other unhashed files keep the default ETag/Last-Modified
+    revalidation so a rebuilt UI is still picked up.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304) and _HASHED_ASSET_RE.match(path):
+            response.headers["Cache-Control"] = _IMMUTABLE_CACHE_CONTROL
+        return response
+
 
 def create_app() -> FastAPI:
     """Create the FastAPI application."""
+    # Every route only reads, so requests borrow a long-lived query-only
+    # connection instead of opening (and re-running the schema on) a new one.
+    read_pool: "queue.Queue[Database]" = queue.Queue(
+        maxsize=int(config.get("api.db_pool_size", _DB_POOL_SIZE))
+    )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        yield
+        # Close pooled connections on shutdown
+        while True:
+            try:
+                read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+
     app = FastAPI(
+        lifespan=lifespan,
         title="Second Brain API",
         description="Local API for timeline visualization and search",
         version="0.1.0",
+        # Search and frame listings return hundreds of rows; orjson encodes
+        # them several times faster than the stdlib encoder
+        default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
     )
 
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    if config.get("api.cors_enabled", True):
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=config.get("api.cors_origins", _DEFAULT_CORS_ORIGINS),
+            allow_credentials=True,
+            allow_methods=["GET", "POST"],
+            allow_headers=["*"],
+            max_age=86400,  # let browsers reuse preflight results for a day
+        )
 
     frames_dir = config.get_frames_dir()
     frames_dir.mkdir(parents=True, exist_ok=True)
     app.mount("/frames", StaticFiles(directory=str(frames_dir)), name="frames")
 
     def get_db() -> Generator[Database, None, None]:
-        db = Database(config=config)
+        try:
+            db = read_pool.get_nowait()
+        except queue.Empty:
+            db = Database(config=config, read_only=True)
         try:
             yield db
         finally:
-            db.close()
+            try:
+                read_pool.put_nowait(db)
+            except queue.Full:
+                # Opened past the pool size (e.g. a raised thread limit)
+                db.close()
 
     @app.get("/api/frames")
     def list_frames(
@@ -51,6 +158,9 @@ def create_app() -> FastAPI:
         end: Optional[int] = Query(None, description="End timestamp (unix seconds)"),
         db: Database = Depends(get_db),
     ):
+        # An inverted range can't match anything; skip the query
+        if start is not None and end is not None and start > end:
+            return {"frames": []}
         frames = db.get_frames(
             limit=limit,
             app_bundle_id=app_bundle_id,
@@ -62,7 +172,7 @@ def create_app() -> FastAPI:
             response.append(
                 {
                     **frame,
-                    "iso_timestamp": datetime.fromtimestamp(frame["timestamp"]).isoformat(),
+                    "iso_timestamp": _iso_timestamp(frame["timestamp"]),
                     "screenshot_url": f"/frames/{frame['file_path']}",
                 }
             )
@@ -73,21 +183,53 @@ def create_app() -> FastAPI:
         frame = db.get_frame(frame_id)
         if not frame:
             raise HTTPException(status_code=404, detail="Frame not found")
-        frame["iso_timestamp"] = datetime.fromtimestamp(frame["timestamp"]).isoformat()
+        frame["iso_timestamp"] = _iso_timestamp(frame["timestamp"])
         frame["screenshot_url"] = f"/frames/{frame['file_path']}"
         return frame
 
+    frame_text_cache: "OrderedDict[str, list]" = OrderedDict()
+    frame_text_lock = threading.Lock()
+
     @app.get("/api/frames/{frame_id}/text")
     def get_frame_text(frame_id: str, db: Database = Depends(get_db)):
+        # Frames are deleted by other processes (CLI, retention cleanup), so
+        # the primary-key lookup runs even on a cache hit; only the text
+        # block fetch is skipped
         frame = db.get_frame(frame_id)
         if not frame:
+            with frame_text_lock:
+                frame_text_cache.pop(frame_id, None)
             raise HTTPException(status_code=404, detail="Frame not found")
+
+        with frame_text_lock:
+            blocks = frame_text_cache.get(frame_id)
+            if blocks is not None:
+                frame_text_cache.move_to_end(frame_id)
+                return {"frame_id": frame_id, "blocks": blocks}
+
         blocks = db.get_text_blocks_by_frame(frame_id)
+        # A frame with no blocks yet may still be waiting for OCR
+        if blocks:
+            with frame_text_lock:
+                frame_text_cache[frame_id] = blocks
+                if len(frame_text_cache) > _FRAME_TEXT_CACHE_SIZE:
+                    frame_text_cache.popitem(last=False)
         return {"frame_id": frame_id, "blocks": blocks}
 
+    # App usage is a grouped scan over every frame; it doesn't need to be
+    # real-time, so serve it from a short-lived per-limit cache.
+    stats_ttl = float(config.get("api.stats_ttl_seconds", 30))
+    app_stats_cache: dict[int, tuple[float, list]] = {}
+
     @app.get("/api/apps")
     def list_apps(limit: int = Query(50, ge=1, le=200), db: Database = Depends(get_db)):
+        now = time.monotonic()
+        cached = app_stats_cache.get(limit)
+        if cached is not None and cached[0] > now:
+            return {"apps": cached[1]}
         stats = db.get_app_usage_stats(limit=limit)
+        if stats_ttl > 0:
+            app_stats_cache[limit] = (now + stats_ttl, stats)
         return {"apps": stats}
 
     @app.post("/api/search")
@@ -118,9 +260,11 @@ def create_app() -> FastAPI:
                     app_filter=app_bundle_id,
                     rerank=reranker,
                 )
+                frames = db.get_frames_bulk([m["frame_id"] for m in matches])
+                blocks = db.get_text_blocks_bulk([m["block_id"] for m in matches])
                 for match in matches:
-                    frame = db.get_frame(match["frame_id"]) or {}
-                    block = db.get_text_block(match["block_id"]) or {}
+                    frame = frames.get(match["frame_id"]) or {}
+                    block = blocks.get(match["block_id"]) or {}
                     if not block:
                         continue
                     results.append(
@@ -147,19 +291,19 @@ def create_app() -> FastAPI:
                 end_timestamp=None,
                 limit=limit,
             )
-            for row in rows:
-                results.append(
-                    {
-                        "frame_id": row.get("frame_id"),
-                        "block_id": row.get("block_id"),
-                        "timestamp": row.get("timestamp"),
-                        "window_title": row.get("window_title") or "Untitled",
-                        "app_name": row.get("app_name") or "Unknown",
-                        "text": row.get("text", ""),
-                        "score": row.get("score"),
-                        "method": "fts",
-                    }
-                )
+            results = [
+                {
+                    "frame_id": row.get("frame_id"),
+                    "block_id": row.get("block_id"),
+                    "timestamp": row.get("timestamp"),
+                    "window_title": row.get("window_title") or "Untitled",
+                    "app_name": row.get("app_name") or "Unknown",
+                    "text": row.get("text", ""),
+                    "score": row.get("score"),
+                    "method": "fts",
+                }
+                for row in rows
+            ]
 
         return {"results": results}
 
@@ -223,12 +367,11 @@ def create_app() -> FastAPI:
         # Call OpenAI server-side so the browser never needs the API key
         try:
             import os
-            from openai import OpenAI
 
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise RuntimeError("OPENAI_API_KEY is not configured on server")
-            client = OpenAI(api_key=api_key)
+            client = _openai_client(api_key)
 
             model = "gpt-5"
             response = client.chat.completions.create(
@@ -271,18 +414,25 @@ def create_app() -> FastAPI:
         return {"answer": answer, "results": results}
 
     # Serve built React UI if present
-    # server.py lives at src/second_brain/api/server.py → repo root is parents[3]
-    ui_dist = (
-        Path(__file__).resolve().parents[3] / "web" / "timeline" / "dist"
-    )
-    if ui_dist.exists():
+    if _UI_DIST.exists():
         app.mount(
             "/",
-            StaticFiles(directory=str(ui_dist), html=True),
+            UIStaticFiles(directory=str(_UI_DIST), html=True),
             name="timeline_ui",
         )
 
     return app
 
 
-app = create_app()
+@functools.cache
+def get_app() -> FastAPI:
+    """Return the process-wide application, creating it on first use."""
+    return create_app()
+
+
+def __getattr__(name: str):
+    # Keep `uvicorn src.second_brain.api.server:app` working without building
+    # the app (and its frames mount and DB pool) on every import
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -19,6 +19,11 @@ from Quartz import (
     kCGNullWindowID,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from ..config import Config
 from .frame_differ import FrameDiffer
 from .activity_monitor import ActivityMonitor
@@ -26,6 +31,13 @@ from .activity_monitor import ActivityMonitor
 logger = structlog.get_logger()
 
 
+def _metadata_json(metadata: Dict[str, Any]) -> bytes:
+    """Serialize frame metadata to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+    return json.dumps(metadata, indent=2).encode("utf-8")
+
+
 class CaptureService:
     """Service for capturing screenshots and window metadata."""
 
@@ -270,11 +282,28 @@ class CaptureService:
                 logger.error("screencapture_failed", returncode=result.returncode)
                 return None
             
-            # Convert to WebP if format is webp
-            if self.format == "webp":
+            # Decode the screenshot once; both the diff and WebP encode use it
+            img = None
+            if self.frame_differ or self.format == "webp":
                 try:
                     from PIL import Image
                     img = Image.open(temp_png_path)
+                except Exception as e:
+                    logger.error("screenshot_decode_failed", error=str(e))
+            
+            # Check if frame should be kept (frame change detection). Done
+            # before the WebP encode so skipped frames never pay for it.
+            if self.frame_differ and not self.frame_differ.should_capture_frame(
+                img if img is not None else temp_png_path
+            ):
+                # Frame is too similar to previous - delete it and skip
+                temp_png_path.unlink()
+                self.frames_skipped += 1
+                return None
+            
+            # Convert to WebP if format is webp
+            if self.format == "webp" and img is not None:
+                try:
                     img.save(frame_path, 'WEBP', quality=self.quality, method=6)
                     temp_png_path.unlink()  # Delete temp PNG
                 except Exception as e:
@@ -284,13 +313,6 @@ class CaptureService:
             else:
                 frame_path = temp_png_path
             
-            # Check if frame should be kept (frame change detection)
-            if self.frame_differ and not self.frame_differ.should_capture_frame(frame_path):
-                # Frame is too similar to previous - delete it and skip
-                frame_path.unlink()
-                self.frames_skipped += 1
-                return None
-            
             # Get file size
             file_size = frame_path.stat().st_size
             self._frames_dir_usage_bytes += file_size
@@ -316,12 +338,9 @@ class CaptureService:
             
             # Save metadata JSON
             metadata_path = frame_path.with_suffix(".json")
-            with open(metadata_path, "w") as f:
-                json.dump(metadata, f, indent=2)
-            try:
-                self._frames_dir_usage_bytes += metadata_path.stat().st_size
-            except OSError:
-                pass
+            metadata_bytes = _metadata_json(metadata)
+            metadata_path.write_bytes(metadata_bytes)
+            self._frames_dir_usage_bytes += len(metadata_bytes)
             
             self.frames_captured += 1
             self.last_capture_time = time.time()
@@ -5,7 +5,7 @@ duplicate frames.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import structlog
 from PIL import Image
@@ -34,18 +34,19 @@ class FrameDiffer:
             similarity_threshold=similarity_threshold
         )
     
-    def should_capture_frame(self, image_path: Path) -> bool:
+    def should_capture_frame(self, image: Union[Path, Image.Image]) -> bool:
         """Determine if a frame should be captured based on content change.
         
         Args:
-            image_path: Path to the current frame image
+            image: The current frame, as a path or an already-opened image
+                (avoids decoding the screenshot a second time)
             
         Returns:
             True if frame should be captured, False if it's too similar to previous
         """
         try:
             # Load image and compute perceptual hash
-            img = Image.open(image_path)
+            img = image if isinstance(image, Image.Image) else Image.open(image)
             current_hash = imagehash.average_hash(img, hash_size=16)
             
             # First frame - always capture
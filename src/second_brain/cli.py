@@ -1,67 +1,197 @@
 """Command-line interface for Second Brain."""
 
 import asyncio
+import atexit
+import contextlib
+import functools
 import os
+import re
 import signal
 import sys
-from datetime import datetime
+import time
+from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
-import psutil
-import structlog
-from dotenv import load_dotenv
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from .config import Config
-from .database import Database
-# Lazy imports for heavy dependencies
-# from .pipeline import ProcessingPipeline
-# from .embeddings import EmbeddingService
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    from rich.console import Console
 
-# Configure structlog with log level filtering
+    from .database import Database
 
+# Heavy dependencies (rich, structlog, psutil, dotenv, the database and the
+# pipeline) are imported inside the commands that need them so that
+# `--help`, `stop` and friends start fast.
 
-def filter_by_level(logger, method_name, event_dict):
-    """Filter logs based on DEBUG environment variable.
-    
-    By default, only show warnings and errors.
-    Set DEBUG=1 to see all logs including info and debug.
+_logging_configured = False
+
+_STREAMLIT_APP_PATH = Path(__file__).parent / "ui" / "streamlit_app.py"
+
+
+# Resolved once at import: set DEBUG before launching the CLI.
+# By default only warnings and errors are shown; DEBUG=1 shows everything.
+_DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
+_LOG_MIN_LEVEL = 10 if _DEBUG else 30
+
+
+def _configure_logging() -> None:
+    """Configure structlog once, before the first command that logs."""
+    global _logging_configured
+    if _logging_configured:
+        return
+
+    import structlog
+
+    try:
+        # orjson renders straight to bytes; skip the str round-trip
+        import orjson
+
+        renderer = structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        logger_factory = structlog.BytesLoggerFactory()
+    except ImportError:
+        renderer = structlog.processors.JSONRenderer()
+        logger_factory = structlog.PrintLoggerFactory()
+
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.add_log_level,
+            renderer,
+        ],
+        # Calls below the level are no-ops: no event dict, no processors run
+        wrapper_class=structlog.make_filtering_bound_logger(_LOG_MIN_LEVEL),
+        context_class=dict,
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
+    )
+    _logging_configured = True
+
+
+def _loop_factory():
+    """Return uvloop's loop factory for long-running commands, if installed.
+
+    The capture service wakes the loop several times a second (capture ticks,
+    OCR batches, executor callbacks); uvloop trims the per-wakeup overhead.
+    Set SECOND_BRAIN_NO_UVLOOP=1 to use the stdlib loop.
     """
-    if os.getenv("DEBUG", "").lower() in ("1", "true", "yes"):
-        return event_dict
-    
-    # Filter out debug and info level logs by default
-    level = event_dict.get("level")
-    if level in ("debug", "info"):
-        raise structlog.DropEvent
-    
-    return event_dict
+    if os.getenv("SECOND_BRAIN_NO_UVLOOP"):
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+@functools.cache
+def _config() -> Config:
+    """Return the configuration, loaded once per CLI invocation."""
+    return Config()
+
+
+def _fmt_ts(ts: float) -> str:
+    """Format an epoch timestamp as local ``YYYY-mm-dd HH:MM:SS``."""
+    return _fmt_ts_seconds(int(ts))
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_ts_seconds(ts: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
 
 
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.add_log_level,
-        filter_by_level,
-        structlog.processors.JSONRenderer(),
-    ],
-    context_class=dict,
-    logger_factory=structlog.PrintLoggerFactory(),
-    cache_logger_on_first_use=True,
-)
+# Characters of matched text shown per query result
+_SNIPPET_CHARS = 200
 
-console = Console()
-logger = structlog.get_logger()
+_DAY_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
 
 
+def _parse_date(date_str: str) -> datetime:
+    """Parse a YYYY-MM-DD string to local midnight of that day.
+
+    ``date.fromisoformat`` alone would also take ``20251020`` on 3.11+, so
+    the shape is checked first.
+
+    Raises:
+        ValueError: If the string is not a valid YYYY-MM-DD date.
+    """
+    if not _DAY_RE.fullmatch(date_str):
+        raise ValueError(f"expected YYYY-MM-DD, got {date_str!r}")
+    day = date.fromisoformat(date_str)
+    return datetime(day.year, day.month, day.day)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_day(date_str: str) -> int:
+    """Convert a YYYY-MM-DD string to a local-midnight unix timestamp.
+
+    Raises:
+        ValueError: If the string is not a valid YYYY-MM-DD date.
+    """
+    return int(_parse_date(date_str).timestamp())
+
+
+@contextlib.contextmanager
+def _maybe_progress(console: "Console", description: str, min_duration: float = 0.15):
+    """Show a spinner only on a terminal and only once work exceeds ``min_duration``."""
+    if not console.is_terminal:
+        yield
+        return
+
+    import threading
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    )
+    progress.add_task(description=description, total=None)
+    lock = threading.Lock()
+    started = False
+    finished = False
+
+    def _start():
+        nonlocal started
+        with lock:
+            if not finished:
+                progress.start()
+                started = True
+
+    timer = threading.Timer(min_duration, _start)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    finally:
+        timer.cancel()
+        with lock:
+            finished = True
+            if started:
+                progress.stop()
+
+
+@functools.cache
+def _db() -> "Database":
+    """Return a database connection shared by the commands of this invocation."""
+    from .database import Database
+
+    db = Database(config=_config())
+    atexit.register(db.close)
+    return db
+
+
+@functools.cache
+def _console() -> "Console":
+    """Return the shared rich console, created on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+@functools.cache
 def get_pid_file() -> Path:
     """Get path to PID file."""
     return Path.home() / "Library" / "Application Support" / "second-brain" / "second-brain.pid"
@@ -69,22 +199,72 @@ def get_pid_file() -> Path:
 
 def _read_pid_file(pid_file: Path) -> tuple[int, Optional[float]]:
     """Read PID file and return PID with optional create time."""
-    pid_raw = pid_file.read_text().strip()
+    raw = pid_file.read_bytes().strip()
+    pid_part, sep, create_time_part = raw.partition(b":")
+    pid = int(pid_part)
     expected_create_time: Optional[float] = None
-
-    if ":" in pid_raw:
-        pid_part, create_time_part = pid_raw.split(":", 1)
-        pid = int(pid_part)
+    if sep:
         try:
             expected_create_time = float(create_time_part)
         except ValueError:
             expected_create_time = None
-    else:
-        pid = int(pid_raw)
 
     return pid, expected_create_time
 
 
+@functools.cache
+def _boot_time() -> float:
+    """Return system boot time (epoch seconds) from /proc/stat."""
+    with open("/proc/stat", "rb") as f:
+        for line in f:
+            if line.startswith(b"btime "):
+                return float(line.split()[1])
+    raise OSError("btime not found in /proc/stat")
+
+
+def _proc_create_time(pid: int) -> float:
+    """Return a process create time from /proc/<pid>/stat (Linux only).
+
+    Uses the same formula as psutil: boot time plus starttime (field 22)
+    divided by the clock tick rate.
+    """
+    with open(f"/proc/{pid}/stat", "rb") as f:
+        stat = f.read()
+    # comm (field 2) may contain spaces/parens; fields resume after the last ") "
+    fields = stat[stat.rindex(b") ") + 2:].split()
+    start_ticks = int(fields[19])  # field 22 overall, counted after pid and comm
+    return _boot_time() + start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+def _psutil_create_time(pid: int) -> float:
+    """Return a process create time via psutil (macOS/BSD fallback)."""
+    import psutil
+
+    return psutil.Process(pid).create_time()
+
+
+def _process_alive(pid: int, expected_create_time: Optional[float]) -> bool:
+    """Check that ``pid`` exists and, if given, started at ``expected_create_time``."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Process exists but belongs to another user
+        pass
+
+    if expected_create_time is None:
+        return True
+
+    try:
+        create_time = _process_create_time(pid)
+    except Exception:
+        return False
+
+    # Allow slight drift in floating point representation
+    return abs(create_time - expected_create_time) <= 0.5
+
+
 def is_running() -> bool:
     """Check if service is running."""
     pid_file = get_pid_file()
@@ -93,27 +273,101 @@ def is_running() -> bool:
 
     try:
         pid, expected_create_time = _read_pid_file(pid_file)
-        process = psutil.Process(pid)
-        if expected_create_time is not None:
-            # Allow slight drift in floating point representation
-            if abs(process.create_time() - expected_create_time) > 0.5:
-                raise psutil.NoSuchProcess(pid)
+        if _process_alive(pid, expected_create_time):
+            return True
+    except (ValueError, OSError):
+        # PID file is invalid
+        pass
 
-        return True
-    except (ValueError, psutil.Error, OSError):
-        # Process doesn't exist or PID file is invalid
-        pid_file.unlink(missing_ok=True)
-        return False
+    # Process doesn't exist or PID file is stale
+    pid_file.unlink(missing_ok=True)
+    return False
+
+
+def _wait_for_exit(pid: int, timeout: float = 5.0) -> bool:
+    """Wait until ``pid`` exits.
+
+    Uses a kqueue NOTE_EXIT notification where available (macOS/BSD) and
+    otherwise polls ``os.kill(pid, 0)`` with exponential backoff.
+
+    Returns:
+        True if the process exited within ``timeout`` seconds
+    """
+    import select
+
+    if hasattr(select, "kqueue"):
+        kq = select.kqueue()
+        try:
+            event = select.kevent(
+                pid,
+                filter=select.KQ_FILTER_PROC,
+                flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                fflags=select.KQ_NOTE_EXIT,
+            )
+            try:
+                return bool(kq.control([event], 1, timeout))
+            except ProcessLookupError:
+                return True
+            except OSError:
+                pass  # Fall back to polling
+        finally:
+            kq.close()
+
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.25)
+
+
+def _process_create_time(pid: int) -> float:
+    """Return a process create time, via /proc on Linux or psutil elsewhere."""
+    if sys.platform.startswith("linux"):
+        return _proc_create_time(pid)
+    return _psutil_create_time(pid)
+
+
+def _fast_rmtree(path: Path) -> None:
+    """Remove a directory tree using scandir entry types instead of per-file stats."""
+    if os.path.islink(path):
+        # Remove the link itself, never the directory it points to
+        os.unlink(path)
+        return
+    pending = [os.fspath(path)]
+    visited = []
+    while pending:
+        current = pending.pop()
+        visited.append(current)
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    os.unlink(entry.path)
+    # Parents are visited before their children, so remove in reverse
+    for directory in reversed(visited):
+        os.rmdir(directory)
 
 
 def save_pid():
     """Save current process PID."""
     pid_file = get_pid_file()
     pid_file.parent.mkdir(parents=True, exist_ok=True)
-    process = psutil.Process(os.getpid())
-    payload = f"{process.pid}:{process.create_time()}"
-    with open(pid_file, "w") as f:
-        f.write(payload)
+    pid = os.getpid()
+    payload = f"{pid}:{_process_create_time(pid)}"
+    # Write a sibling file then rename so readers never see a partial PID file
+    tmp_file = pid_file.with_suffix(pid_file.suffix + ".tmp")
+    tmp_file.write_text(payload)
+    os.replace(tmp_file, pid_file)
 
 
 def remove_pid():
@@ -126,13 +380,18 @@ def remove_pid():
 @click.version_option(version="0.1.0")
 def main():
     """Second Brain - Local-first visual memory capture and search."""
-    pass
+    from dotenv import load_dotenv
+
+    # Load environment variables
+    load_dotenv()
 
 
 @main.command()
 @click.option("--fps", type=float, help="Frames per second to capture")
 def start(fps: Optional[float]):
     """Start the capture service."""
+    _configure_logging()
+    console = _console()
     if is_running():
         console.print("[yellow]Service is already running[/yellow]")
         return
@@ -140,7 +399,7 @@ def start(fps: Optional[float]):
     console.print("[green]Starting Second Brain capture service...[/green]")
     
     # Load config
-    config = Config()
+    config = _config()
     
     # Override FPS if provided
     if fps:
@@ -155,16 +414,24 @@ def start(fps: Optional[float]):
     # Create pipeline
     pipeline = ProcessingPipeline(config)
     
-    # Setup signal handlers
-    def signal_handler(sig, frame):
-        console.print("\n[yellow]Stopping service...[/yellow]")
-        asyncio.create_task(pipeline.stop())
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     # Start pipeline
     async def run():
+        # Signal handlers on the running loop just wake the main task, which
+        # then stops the pipeline; no timer wakeups while capture runs.
+        loop = asyncio.get_running_loop()
+        stop_requested = asyncio.Event()
+
+        def request_stop():
+            console.print("\n[yellow]Stopping service...[/yellow]")
+            stop_requested.set()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, request_stop)
+            except NotImplementedError:
+                # Windows: SIGINT still surfaces as KeyboardInterrupt below
+                pass
+
         try:
             await pipeline.start()
             
@@ -172,9 +439,8 @@ def start(fps: Optional[float]):
             console.print(f"[green]✓[/green] Capturing at {config.get('capture.fps')} FPS")
             console.print("[green]✓[/green] Press Ctrl+C to stop")
             
-            # Keep running
-            while pipeline.running:
-                await asyncio.sleep(1)
+            # Keep running until a stop signal arrives
+            await stop_requested.wait()
             
         except KeyboardInterrupt:
             console.print("\n[yellow]Stopping service...[/yellow]")
@@ -184,7 +450,8 @@ def start(fps: Optional[float]):
             console.print("[green]Service stopped[/green]")
     
     try:
-        asyncio.run(run())
+        with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+            runner.run(run())
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         remove_pid()
@@ -194,6 +461,8 @@ def start(fps: Optional[float]):
 @main.command()
 def stop():
     """Stop the capture service."""
+    _configure_logging()
+    console = _console()
     if not is_running():
         console.print("[yellow]Service is not running[/yellow]")
         return
@@ -211,12 +480,10 @@ def stop():
         console.print(f"[green]✓[/green] Sent stop signal to process {pid}")
         
         # Wait for process to stop
-        import time
-        for _ in range(10):
-            if not is_running():
-                console.print("[green]Service stopped[/green]")
-                return
-            time.sleep(0.5)
+        if _wait_for_exit(pid, timeout=5.0):
+            remove_pid()
+            console.print("[green]Service stopped[/green]")
+            return
         
         console.print("[yellow]Service may still be stopping...[/yellow]")
         
@@ -228,15 +495,19 @@ def stop():
 @main.command()
 def status():
     """Show service status."""
+    _configure_logging()
+    console = _console()
     if not is_running():
         console.print("[yellow]Service is not running[/yellow]")
         return
     
     console.print("[green]Service is running[/green]")
     
+    from rich.table import Table
+
     # Get stats from database
     try:
-        db = Database()
+        db = _db()
         stats = db.get_database_stats()
         
         table = Table(title="Second Brain Status")
@@ -253,17 +524,13 @@ def status():
             table.add_row("Database Size", f"{size_mb:.2f} MB")
         
         if stats["oldest_frame_timestamp"]:
-            oldest = datetime.fromtimestamp(stats["oldest_frame_timestamp"])
-            table.add_row("Oldest Frame", oldest.strftime("%Y-%m-%d %H:%M:%S"))
+            table.add_row("Oldest Frame", _fmt_ts(stats["oldest_frame_timestamp"]))
         
         if stats["newest_frame_timestamp"]:
-            newest = datetime.fromtimestamp(stats["newest_frame_timestamp"])
-            table.add_row("Newest Frame", newest.strftime("%Y-%m-%d %H:%M:%S"))
+            table.add_row("Newest Frame", _fmt_ts(stats["newest_frame_timestamp"]))
         
         console.print(table)
         
-        db.close()
-        
     except Exception as e:
         console.print(f"[red]Error getting stats: {e}[/red]")
 
@@ -278,6 +545,8 @@ def status():
 @click.option("--reranker", is_flag=True, help="Use AI reranking for better relevance (requires FlagEmbedding)")
 def query(query: str, app: Optional[str], from_date: Optional[str], to_date: Optional[str], limit: int, semantic: bool, reranker: bool):
     """Search captured memory."""
+    _configure_logging()
+    console = _console()
     console.print(f"[cyan]Searching for:[/cyan] {query}")
     
     # Parse dates
@@ -286,33 +555,28 @@ def query(query: str, app: Optional[str], from_date: Optional[str], to_date: Opt
     
     if from_date:
         try:
-            dt = datetime.strptime(from_date, "%Y-%m-%d")
-            start_timestamp = int(dt.timestamp())
+            start_timestamp = _parse_day(from_date)
         except ValueError:
             console.print("[red]Invalid from date format. Use YYYY-MM-DD[/red]")
             return
     
     if to_date:
         try:
-            dt = datetime.strptime(to_date, "%Y-%m-%d")
-            end_timestamp = int(dt.timestamp())
+            end_timestamp = _parse_day(to_date)
         except ValueError:
             console.print("[red]Invalid to date format. Use YYYY-MM-DD[/red]")
             return
     
+    from rich.console import Group
+    from rich.panel import Panel
+
     # Search database
     try:
-        db = Database()
+        db = _db()
         
         display_results = []
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            progress.add_task(description="Searching...", total=None)
-
+        with _maybe_progress(console, "Searching..."):
             if semantic:
                 # Lazy import heavy dependencies only when needed
                 from .embeddings import EmbeddingService
@@ -325,11 +589,15 @@ def query(query: str, app: Optional[str], from_date: Optional[str], to_date: Opt
                     rerank=reranker,  # Enable reranking if flag is set
                 )
 
+                # Two batched lookups instead of two queries per match
+                frames = db.get_frames_bulk([m["frame_id"] for m in matches])
+                blocks = db.get_text_blocks_bulk([m["block_id"] for m in matches])
+
                 for match in matches:
-                    frame = db.get_frame(match["frame_id"])
+                    frame = frames.get(match["frame_id"])
                     if not frame:
                         continue
-                    block = db.get_text_block(match["block_id"])
+                    block = blocks.get(match["block_id"])
                     if not block:
                         continue
                     display_results.append(
@@ -349,6 +617,8 @@ def query(query: str, app: Optional[str], from_date: Optional[str], to_date: Opt
                     start_timestamp=start_timestamp,
                     end_timestamp=end_timestamp,
                     limit=limit,
+                    # One char past the snippet length is enough to know it was cut
+                    text_limit=_SNIPPET_CHARS + 1,
                 )
                 for result in results:
                     display_results.append(
@@ -369,7 +639,6 @@ def query(query: str, app: Optional[str], from_date: Optional[str], to_date: Opt
         # Generate AI answer from search results if semantic search
         if semantic and display_results:
             try:
-                import os
                 from openai import OpenAI
                 
                 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -388,7 +657,6 @@ def query(query: str, app: Optional[str], from_date: Optional[str], to_date: Opt
                     )
                 
                 for i, result in enumerate(display_results[:40]):  # limit context size for reliability
-                    ts = datetime.fromtimestamp(result["timestamp"])
                     app = result.get("app_name", "Unknown")
                     window = result.get("window_title", "")
                     text = result.get("text", "").strip()
@@ -401,7 +669,7 @@ def query(query: str, app: Optional[str], from_date: Optional[str], to_date: Opt
                     text = _sanitize_text(" ".join(text.split()))[:300]  # Clean and limit
                     
                     context_items.append(f"""[RELEVANCE: {relevance}]
-Time: {ts.strftime('%Y-%m-%d %H:%M:%S')}
+Time: {_fmt_ts(result['timestamp'])}
 Application: {app}
 Window: {window}
 Content:
@@ -444,14 +712,13 @@ Content:
                     console.print(f"[yellow]Empty answer (finish_reason={finish_reason}). Retrying with condensed context...[/yellow]")
                     condensed_items = []
                     for j, result in enumerate(display_results[:10]):
-                        ts2 = datetime.fromtimestamp(result["timestamp"])
                         app2 = result.get("app_name", "Unknown")
                         window2 = result.get("window_title", "")
                         text2 = result.get("text", "").strip()
                         if not text2:
                             continue
                         text2 = _sanitize_text(" ".join(text2.split()))[:200]
-                        condensed_items.append(f"[{ts2.strftime('%Y-%m-%d %H:%M:%S')}] {app2} • {window2}\n{text2}")
+                        condensed_items.append(f"[{_fmt_ts(result['timestamp'])}] {app2} • {window2}\n{text2}")
                     condensed_context = "\n\n".join(condensed_items)
                     try:
                         response2 = client.responses.create(
@@ -476,9 +743,13 @@ Content:
         
         console.print(f"\n[green]Found {len(display_results)} results:[/green]\n")
         
+        # Lay out all results in one render pass; skip Rich entirely when piped
+        rich_output = console.is_terminal
+        panels = []
+        plain_lines = []
         for i, result in enumerate(display_results, 1):
-            timestamp = datetime.fromtimestamp(result["timestamp"])
-            score_line = ""
+            ts_text = _fmt_ts(result["timestamp"])
+            score_text = ""
             raw_score = result.get("score")
             if raw_score is not None:
                 if result["method"] == "semantic":
@@ -487,18 +758,32 @@ Content:
                 else:
                     score_label = "Relevance"
                     display_score = 1 / (1 + raw_score) if raw_score >= 0 else raw_score
-                score_line = f"\n[dim]{score_label}: {display_score:.3f}[/dim]"
+                score_text = f"{score_label}: {display_score:.3f}"
+            snippet = f"{result['text'][:_SNIPPET_CHARS]}{'...' if len(result['text']) > _SNIPPET_CHARS else ''}"
             
-            panel = Panel(
-                f"[bold]{result['window_title']}[/bold]\n"
-                f"[dim]{result['app_name']} • {timestamp.strftime('%Y-%m-%d %H:%M:%S')}[/dim]{score_line}\n\n"
-                f"{result['text'][:200]}{'...' if len(result['text']) > 200 else ''}",
-                title=f"Result {i}",
-                border_style="cyan",
-            )
-            console.print(panel)
+            if rich_output:
+                score_line = f"\n[dim]{score_text}[/dim]" if score_text else ""
+                panels.append(Panel(
+                    f"[bold]{result['window_title']}[/bold]\n"
+                    f"[dim]{result['app_name']} • {ts_text}[/dim]{score_line}\n\n"
+                    f"{snippet}",
+                    title=f"Result {i}",
+                    border_style="cyan",
+                ))
+            else:
+                score_part = f" • {score_text}" if score_text else ""
+                plain_lines.append(
+                    f"--- Result {i} ---\n"
+                    f"{result['window_title']}\n"
+                    f"{result['app_name']} • {ts_text}{score_part}\n\n"
+                    f"{snippet}\n\n"
+                )
         
-        db.close()
+        if rich_output:
+            console.print(Group(*panels))
+        else:
+            sys.stdout.write("".join(plain_lines))
+            sys.stdout.flush()
         
     except Exception as e:
         console.print(f"[red]Error searching: {e}[/red]")
@@ -511,13 +796,15 @@ Content:
 @click.option("--keep-frames", is_flag=True, help="Keep original frames after conversion")
 def convert_to_video(date: Optional[str], keep_frames: bool):
     """Convert captured frames to H.264 video for storage efficiency."""
-    from datetime import datetime, timedelta
+    _configure_logging()
+    console = _console()
+    from datetime import timedelta
     from .video.simple_video_capture import VideoConverter
     
     # Parse date or use yesterday
     if date:
         try:
-            target_date = datetime.strptime(date, "%Y-%m-%d")
+            target_date = _parse_date(date)
         except ValueError:
             console.print("[red]Invalid date format. Use YYYY-MM-DD[/red]")
             return
@@ -527,7 +814,7 @@ def convert_to_video(date: Optional[str], keep_frames: bool):
     console.print(f"[cyan]Converting frames from {target_date.strftime('%Y-%m-%d')} to H.264 video...[/cyan]")
     
     # Create converter
-    config = Config()
+    config = _config()
     if keep_frames:
         config.set("video.delete_frames_after_conversion", False)
     else:
@@ -551,7 +838,12 @@ def convert_to_video(date: Optional[str], keep_frames: bool):
             console.print("[red]✗ Conversion failed[/red]")
     
     try:
-        asyncio.run(do_conversion())
+        # One coroutine chain; a small default executor is plenty for it
+        from concurrent.futures import ThreadPoolExecutor
+
+        with asyncio.Runner() as runner:
+            runner.get_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+            runner.run(do_conversion())
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
 
@@ -559,8 +851,13 @@ def convert_to_video(date: Optional[str], keep_frames: bool):
 @main.command()
 def health():
     """Check system health."""
+    _configure_logging()
+    console = _console()
     console.print("[cyan]Checking system health...[/cyan]\n")
     
+    import psutil
+    from rich.table import Table
+
     checks = []
     
     # Check if service is running
@@ -577,16 +874,14 @@ def health():
     
     # Check database
     try:
-        db = Database()
-        db.close()
+        _db().ping()
         checks.append(("Database", "✓ Accessible", "green"))
     except Exception as e:
         checks.append(("Database", f"✗ Error: {e}", "red"))
     
     # Check disk space
     try:
-        import psutil
-        config = Config()
+        config = _config()
         frames_dir = config.get_frames_dir()
         # Create directory if it doesn't exist
         frames_dir.mkdir(parents=True, exist_ok=True)
@@ -615,29 +910,38 @@ def health():
 @click.option("--port", default=8501, show_default=True, type=int)
 def ui(port: int):
     """Launch the Streamlit UI for daily summaries and visual timeline."""
-    import subprocess
-    import sys
+    _configure_logging()
+    console = _console()
     
-    # Get path to streamlit app
-    app_path = Path(__file__).parent / "ui" / "streamlit_app.py"
-    
-    if not app_path.exists():
+    # The app ships with the package; Streamlit reports a missing file itself
+    app_path = _STREAMLIT_APP_PATH
+    if _DEBUG and not app_path.is_file():
         console.print(f"[red]Streamlit app not found at {app_path}[/red]")
         return
     
     console.print(f"[green]Launching Second Brain UI on port {port}...[/green]")
     console.print("[dim]Press Ctrl+C to stop[/dim]")
     
+    args = [
+        sys.executable, "-m", "streamlit", "run",
+        str(app_path),
+        "--server.port", str(port),
+        "--server.headless", "false",
+    ]
+    
     try:
-        # Launch streamlit
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run",
-            str(app_path),
-            "--server.port", str(port),
-            "--server.headless", "false",
-        ])
-    except KeyboardInterrupt:
-        console.print("\n[yellow]Shutting down UI...[/yellow]")
+        if os.name == "nt":
+            import subprocess
+
+            try:
+                subprocess.run(args)
+            except KeyboardInterrupt:
+                console.print("\n[yellow]Shutting down UI...[/yellow]")
+        else:
+            # Replace this process with Streamlit; it receives Ctrl+C directly
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.execvp(args[0], args)
     except Exception as e:
         console.print(f"[red]Error launching UI: {e}[/red]")
         console.print("[yellow]Make sure streamlit is installed: pip install streamlit[/yellow]")
@@ -649,16 +953,17 @@ def ui(port: int):
 @click.option("--no-open", is_flag=True, help="Do not open the browser automatically")
 def timeline(host: str, port: int, no_open: bool):
     """Launch the timeline visualization server (React UI)."""
+    _configure_logging()
+    console = _console()
     try:
         from uvicorn import Config as UvicornConfig, Server as UvicornServer
     except ImportError as exc:
         console.print("[red]uvicorn is not installed. Please install with `pip install uvicorn`.[/red]")
         raise click.ClickException(str(exc))
 
-    from .api.server import create_app
+    from .api.server import get_app
 
-    app = create_app()
-    config = UvicornConfig(app=app, host=host, port=port, log_level="info")
+    config = UvicornConfig(app=get_app(), host=host, port=port, log_level="info")
     server = UvicornServer(config)
 
     url = f"http://{host}:{port}"
@@ -683,7 +988,8 @@ def timeline(host: str, port: int, no_open: bool):
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation prompt")
 def reset(yes: bool):
     """Reset Second Brain by deleting all captured data and database."""
-    import shutil
+    _configure_logging()
+    console = _console()
     
     console.print("[yellow]Second Brain Reset[/yellow]\n")
     console.print("This will delete ALL captured data including:")
@@ -716,16 +1022,11 @@ def reset(yes: bool):
             os.kill(pid, signal.SIGTERM)
             
             # Wait for process to stop
-            import time
-            for _ in range(10):
-                if not is_running():
-                    break
-                time.sleep(0.5)
-            
-            if is_running():
-                console.print("[red]Warning: Service may still be running[/red]")
-            else:
+            if _wait_for_exit(pid, timeout=5.0):
+                remove_pid()
                 console.print("[green]✓[/green] Service stopped")
+            else:
+                console.print("[red]Warning: Service may still be running[/red]")
         except Exception as e:
             console.print(f"[yellow]Warning: {e}[/yellow]")
             remove_pid()
@@ -735,7 +1036,7 @@ def reset(yes: bool):
     console.print()
     
     # Get data directory
-    config = Config()
+    config = _config()
     data_dir = config.get_data_dir()
     
     if not data_dir.exists():
@@ -754,13 +1055,20 @@ def reset(yes: bool):
         ("logs", config.get_logs_dir()),
     ]
     
-    for name, dir_path in dirs_to_remove:
-        if dir_path.exists():
-            console.print(f"  • Removing {name}...")
+    # Directories are independent, so delete them concurrently
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    with ThreadPoolExecutor(max_workers=len(dirs_to_remove)) as pool:
+        futures = {}
+        for name, dir_path in dirs_to_remove:
+            if dir_path.exists():
+                console.print(f"  • Removing {name}...")
+                futures[pool.submit(_fast_rmtree, dir_path)] = name
+        for future in as_completed(futures):
             try:
-                shutil.rmtree(dir_path)
+                future.result()
             except Exception as e:
-                console.print(f"[red]    Error removing {name}: {e}[/red]")
+                console.print(f"[red]    Error removing {futures[future]}: {e}[/red]")
     
     # Remove PID file
     pid_file = get_pid_file()
@@ -1,8 +1,35 @@
 """Configuration management for Second Brain."""
 
+import functools
 import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import zlib
 from pathlib import Path
-from typing import Any, Dict
+from typing import IO, Any, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -36,6 +63,8 @@ DEFAULT_CONFIG = {
         "model": "sentence-transformers/all-MiniLM-L6-v2",
         "dimension": 384,
         "enabled": True,
+        # Inference backend: "torch", "onnx", or "onnx-quantized" (INT8)
+        "backend": "torch",
         # Optional reranker for improved search relevance
         "reranker_enabled": False,
         "reranker_model": "BAAI/bge-reranker-large",
@@ -43,6 +72,51 @@ DEFAULT_CONFIG = {
 }
 
 
+# Standard locations, resolved once at import
+_DATA_DIR = Path.home() / "Library" / "Application Support" / "second-brain"
+_CONFIG_PATH = _DATA_DIR / "config" / "settings.json"
+_FRAMES_DIR = _DATA_DIR / "frames"
+_DATABASE_DIR = _DATA_DIR / "database"
+_EMBEDDINGS_DIR = _DATA_DIR / "embeddings"
+_LOGS_DIR = _DATA_DIR / "logs"
+_CACHE_DIR = _DATA_DIR / "cache"
+
+# Below this size a plain read is cheaper than setting up a mapping
+_MMAP_MIN_BYTES = 64 * 1024
+
+# Config cache header: settings.json mtime_ns, size, and a checksum of the defaults
+_CACHE_HEADER = struct.Struct("<qqI")
+
+
+# Pickled once; loads() gives a fast, fully independent copy of the defaults
+# (dict.copy() is shallow and would let callers mutate nested defaults)
+_DEFAULT_CONFIG_BLOB = pickle.dumps(DEFAULT_CONFIG, protocol=pickle.HIGHEST_PROTOCOL)
+# Checksum of the defaults so a code change invalidates cached merges
+_DEFAULT_CONFIG_CRC = zlib.crc32(_DEFAULT_CONFIG_BLOB)
+
+
+def _default_config() -> Dict[str, Any]:
+    """Return a deep copy of DEFAULT_CONFIG."""
+    return pickle.loads(_DEFAULT_CONFIG_BLOB)
+
+
+@functools.cache
+def _key_path(key: str) -> tuple[str, ...]:
+    """Split a dot-notation key once; callers use a small fixed set of keys."""
+    return tuple(key.split("."))
+
+
+def _sibling_tempfile(path: Path) -> IO[bytes]:
+    """Open a uniquely named temp file next to ``path`` to os.replace() over it.
+    
+    The daemon, API server and CLI all load (and may save) the same files, so
+    a fixed temp name could be written by two processes at once.
+    """
+    return tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+    )
+
+
 class Config:
     """Configuration manager for Second Brain."""
 
@@ -58,56 +132,128 @@ class Config:
     @staticmethod
     def get_default_config_path() -> Path:
         """Get default configuration file path."""
-        return Path.home() / "Library" / "Application Support" / "second-brain" / "config" / "settings.json"
+        return _CONFIG_PATH
 
     @staticmethod
     def get_data_dir() -> Path:
         """Get data directory path."""
-        return Path.home() / "Library" / "Application Support" / "second-brain"
+        return _DATA_DIR
 
     @staticmethod
     def get_frames_dir() -> Path:
         """Get frames directory path."""
-        return Config.get_data_dir() / "frames"
+        return _FRAMES_DIR
 
     @staticmethod
     def get_database_dir() -> Path:
         """Get database directory path."""
-        return Config.get_data_dir() / "database"
+        return _DATABASE_DIR
 
     @staticmethod
     def get_embeddings_dir() -> Path:
         """Get embeddings directory path."""
-        return Config.get_data_dir() / "embeddings"
+        return _EMBEDDINGS_DIR
 
     @staticmethod
     def get_logs_dir() -> Path:
         """Get logs directory path."""
-        return Config.get_data_dir() / "logs"
+        return _LOGS_DIR
+
+    @staticmethod
+    def get_cache_dir() -> Path:
+        """Get cache directory path."""
+        return _CACHE_DIR
+
+    @property
+    def cache_path(self) -> Path | None:
+        """Path of the parsed-config pickle, or None when it isn't used.
+        
+        Only the app's own settings file is cached; an explicit config_path
+        (tests, tools pointing at another file) is always parsed directly.
+        """
+        if self.config_path != self.get_default_config_path():
+            return None
+        return self.get_cache_dir() / "settings.cache.pkl"
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default."""
-        if self.config_path.exists():
-            with open(self.config_path, "r") as f:
-                user_config = json.load(f)
-                # Merge with defaults
-                config = DEFAULT_CONFIG.copy()
-                self._deep_merge(config, user_config)
-                return config
+        try:
+            st = self.config_path.stat()
+        except FileNotFoundError:
+            st = None
+        if st is not None:
+            header = _CACHE_HEADER.pack(st.st_mtime_ns, st.st_size, _DEFAULT_CONFIG_CRC)
+            cached = self._read_cache(header)
+            if cached is not None:
+                return cached
+            
+            user_config = self._read_user_config(st.st_size)
+            # Merge with defaults
+            config = _default_config()
+            self._deep_merge(config, user_config)
+            self._write_cache(header, config)
+            return config
         else:
             # Create default config
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, "w") as f:
-                json.dump(DEFAULT_CONFIG, f, indent=2)
-            return DEFAULT_CONFIG.copy()
+            self.config_path.write_bytes(_json_dumps(DEFAULT_CONFIG))
+            return _default_config()
+
+    def _read_user_config(self, size: int) -> Dict[str, Any]:
+        """Parse settings.json, memory-mapping it when it is large enough to matter."""
+        if size < _MMAP_MIN_BYTES or orjson is None:
+            return _json_loads(self.config_path.read_bytes())
+        with open(self.config_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+
+    def _read_cache(self, header: bytes) -> Dict[str, Any] | None:
+        """Return the cached merged config if its header matches, else None."""
+        cache_path = self.cache_path
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, "rb") as f:
+                if f.read(_CACHE_HEADER.size) != header:
+                    return None
+                config = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or truncated; drop it so it is rebuilt from settings.json
+            cache_path.unlink(missing_ok=True)
+            return None
+        return config if isinstance(config, dict) else None
+
+    def _write_cache(self, header: bytes, config: Dict[str, Any]) -> None:
+        """Atomically write the merged config cache; failures are ignored."""
+        cache_path = self.cache_path
+        if cache_path is None:
+            return
+        tmp_path: Path | None = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with _sibling_tempfile(cache_path) as f:
+                tmp_path = Path(f.name)
+                f.write(header)
+                pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
 
     def _deep_merge(self, base: Dict, update: Dict) -> None:
         """Deep merge update dict into base dict."""
-        for key, value in update.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._deep_merge(base[key], value)
-            else:
-                base[key] = value
+        stack = [(base, update)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    stack.append((current, value))
+                else:
+                    target[key] = value
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by dot-notation key.
@@ -119,7 +265,7 @@ class Config:
         Returns:
             Configuration value or default
         """
-        keys = key.split(".")
+        keys = _key_path(key)
         value = self.config
         for k in keys:
             if isinstance(value, dict) and k in value:
@@ -135,7 +281,7 @@ class Config:
             key: Configuration key in dot notation (e.g., 'capture.fps')
             value: Value to set
         """
-        keys = key.split(".")
+        keys = _key_path(key)
         config = self.config
         for k in keys[:-1]:
             if k not in config:
@@ -146,12 +292,26 @@ class Config:
     def save(self) -> None:
         """Save configuration to file."""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_path, "w") as f:
-            json.dump(self.config, f, indent=2)
+        # Write a sibling file and rename it over settings.json so a crash
+        # mid-write can never leave a truncated config behind
+        tmp_path: Path | None = None
+        try:
+            with _sibling_tempfile(self.config_path) as f:
+                tmp_path = Path(f.name)
+                f.write(_json_dumps(self.config))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_path)
+        except BaseException:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            raise
+        if self.cache_path is not None:
+            self.cache_path.unlink(missing_ok=True)
 
     def reset_all(self) -> None:
         """Reset configuration to defaults."""
-        self.config = DEFAULT_CONFIG.copy()
+        self.config = _default_config()
         self.save()
 
     def ensure_directories(self) -> None:
@@ -164,8 +324,9 @@ class Config:
             self.get_logs_dir(),
             self.config_path.parent,
         ]
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+        # Shortest first so shared parents exist before their children
+        for directory in sorted({os.fspath(d) for d in directories}, key=len):
+            os.makedirs(directory, exist_ok=True)
 
 
 # Global config instance
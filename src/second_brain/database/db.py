@@ -11,26 +11,37 @@ from ..config import Config
 
 logger = structlog.get_logger()
 
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds
+MAX_SQL_VARIABLES = 999
+
 
 class Database:
     """SQLite database interface for Second Brain."""
 
-    def __init__(self, db_path: Optional[Path] = None, config: Optional[Config] = None):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        config: Optional[Config] = None,
+        read_only: bool = False,
+    ):
         """Initialize database connection.
         
         Args:
             db_path: Path to database file. If None, uses default location.
             config: Configuration instance. If None, uses global config.
+            read_only: Open a query-only connection that may be handed between
+                threads (one user at a time), e.g. from an API connection pool.
         """
         self.config = config or Config()
         self.db_path = db_path or (self.config.get_database_dir() / "memory.db")
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only
         self.conn: Optional[sqlite3.Connection] = None
         self._initialize_db()
 
     def _initialize_db(self) -> None:
         """Initialize database with schema."""
-        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=not self.read_only)
         self.conn.row_factory = sqlite3.Row
         
         # Enable foreign keys
@@ -51,7 +62,11 @@ class Database:
         self.conn.executescript(schema)
         self.conn.commit()
         
-        logger.info("database_initialized", db_path=str(self.db_path), wal_mode=True)
+        if self.read_only:
+            # Reject writes on this handle; WAL lets it read alongside the writer
+            self.conn.execute("PRAGMA query_only = ON")
+        
+        logger.info("database_initialized", db_path=str(self.db_path), wal_mode=True, read_only=self.read_only)
 
     def close(self) -> None:
         """Close database connection."""
@@ -59,6 +74,10 @@ class Database:
             self.conn.close()
             self.conn = None
 
+    def ping(self) -> bool:
+        """Run a trivial query to confirm the connection is usable."""
+        return self.conn.execute("SELECT 1").fetchone() is not None
+
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -261,6 +280,44 @@ class Database:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+    def get_frames_bulk(self, frame_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get many frames by ID using batched IN queries.
+        
+        Args:
+            frame_ids: Frame identifiers (duplicates are fetched once)
+            
+        Returns:
+            Mapping of frame_id to frame dictionary; unknown IDs are omitted
+        """
+        return self._get_rows_by_ids("frames", "frame_id", frame_ids)
+
+    def get_text_blocks_bulk(self, block_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get many text blocks by ID using batched IN queries.
+        
+        Args:
+            block_ids: Text block identifiers (duplicates are fetched once)
+            
+        Returns:
+            Mapping of block_id to text block dictionary; unknown IDs are omitted
+        """
+        return self._get_rows_by_ids("text_blocks", "block_id", block_ids)
+
+    def _get_rows_by_ids(self, table: str, key_column: str, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch rows keyed by a primary key column, chunked to the SQL variable limit."""
+        unique_ids = list(dict.fromkeys(ids))
+        rows: Dict[str, Dict[str, Any]] = {}
+        cursor = self.conn.cursor()
+        for start in range(0, len(unique_ids), MAX_SQL_VARIABLES):
+            chunk = unique_ids[start:start + MAX_SQL_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT * FROM {table} WHERE {key_column} IN ({placeholders})",
+                chunk,
+            )
+            for row in cursor.fetchall():
+                rows[row[key_column]] = dict(row)
+        return rows
+
     def get_frames(
         self,
         limit: int = 500,
@@ -307,6 +364,7 @@ class Database:
         start_timestamp: Optional[int] = None,
         end_timestamp: Optional[int] = None,
         limit: int = 50,
+        text_limit: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Full-text search across text blocks.
         
@@ -316,12 +374,21 @@ class Database:
             start_timestamp: Optional start timestamp filter
             end_timestamp: Optional end timestamp filter
             limit: Maximum number of results
+            text_limit: If set, truncate each block's text to this many
+                characters in SQL rather than returning the full OCR text
             
         Returns:
             List of search results with frame and text block data
         """
+        params: List[Any] = []
+        if text_limit is not None:
+            text_column = "substr(tb.text, 1, ?) AS text"
+            params.append(text_limit)
+        else:
+            text_column = "tb.text"
+        
         # Build query with filters
-        sql = """
+        sql = f"""
             SELECT
                 f.frame_id,
                 f.timestamp,
@@ -330,7 +397,7 @@ class Database:
                 f.app_name,
                 f.file_path,
                 tb.block_id,
-                tb.text,
+                {text_column},
                 tb.confidence,
                 tb.bbox_x,
                 tb.bbox_y,
@@ -343,7 +410,7 @@ class Database:
             WHERE text_blocks_fts MATCH ?
         """
         
-        params: List[Any] = [query]
+        params.append(query)
         
         if app_filter:
             sql += " AND f.app_bundle_id = ?"
@@ -1,18 +1,17 @@
 """Embedding and reranking service using Chroma, SentenceTransformers or OpenAI, and BAAI bge reranker."""
 
+import atexit
+import hashlib
+import importlib.util
 import os
-from typing import Dict, List, Any, Optional
+import platform
+import queue
+import threading
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Any, Optional, Tuple
 
-import chromadb
-from chromadb.config import Settings
+import numpy as np
 import structlog
-from sentence_transformers import SentenceTransformer
-
-try:
-    # Optional: BAAI reranker
-    from FlagEmbedding import FlagReranker  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    FlagReranker = None  # type: ignore
 
 try:
     # Optional OpenAI provider
@@ -22,8 +21,81 @@ except Exception:  # pragma: no cover - optional dependency
 
 from ..config import Config
 
+if TYPE_CHECKING:
+    # chromadb, sentence-transformers and FlagEmbedding pull in torch and
+    # friends; they're imported where first used so importing this module
+    # (and anything that merely references EmbeddingService) stays cheap.
+    from sentence_transformers import SentenceTransformer
+
 logger = structlog.get_logger()
 
+# HNSW build/search parameters for newly created collections
+# (override per key via embeddings.hnsw in settings.json)
+DEFAULT_HNSW_PARAMS: Dict[str, Any] = {
+    # Embeddings are L2-normalized, so inner product ranks like cosine
+    "space": "ip",
+    "M": 24,
+    "construction_ef": 128,
+    "search_ef": 100,
+    "batch_size": 1000,
+    "sync_threshold": 10000,
+}
+
+# Cap on candidates fed to the cross-encoder; its cost grows linearly with this
+RERANK_MAX_CANDIDATES = 64
+
+# Recent query embeddings, shared by every service in the process: search
+# paths create a fresh EmbeddingService per request, so a per-instance cache
+# would never hit. Keyed on (model key, query text).
+_query_cache: "OrderedDict[Tuple[str, ...], np.ndarray]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+# Concurrent encodes (the daemon's encoder, API searches on worker threads,
+# each with their own service) would each fan out over the whole BLAS thread
+# pool; run them one at a time across the process instead
+_model_lock = threading.Lock()
+
+
+def _to_chroma(embeddings: np.ndarray) -> List[List[float]]:
+    """Convert a 2-D embedding array to the nested lists Chroma 0.4 validates.
+    
+    Chroma 0.4 rejects ndarrays (it type-checks for list of float), so this is
+    the single conversion point; everything upstream stays in numpy.
+    """
+    return embeddings.tolist()
+
+
+# Pre-quantized ONNX files as published on the hub (and as written by
+# export_dynamic_quantized_onnx_model); avx2 quantizes weights to uint8
+_ONNX_QUANTIZED_FILES = {
+    "arm64": "onnx/model_qint8_arm64.onnx",
+    "avx2": "onnx/model_quint8_avx2.onnx",
+    "avx512": "onnx/model_qint8_avx512.onnx",
+    "avx512_vnni": "onnx/model_qint8_avx512_vnni.onnx",
+}
+
+
+def _default_quantization_config() -> str:
+    """Pick the ONNX Runtime INT8 kernel set this CPU supports."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+    # AVX-512 is only advertised reliably via /proc/cpuinfo; everywhere else
+    # fall back to AVX2, which every x86-64 Mac since 2013 has
+    flags: set = set()
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = set(line.split(":", 1)[1].split())
+                    break
+    except OSError:
+        pass
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
 
 class EmbeddingService:
     """Service for creating and searching embeddings."""
@@ -43,21 +115,77 @@ class EmbeddingService:
         
         self.enabled = True
         
+        # Background pipeline: index_text_blocks() queues rows, an encoder
+        # thread embeds them in batches and a writer thread upserts them
+        self._write_batch_size = int(self.config.get("embeddings.write_batch_size", 256))
+        self._write_interval = float(self.config.get("embeddings.write_interval_seconds", 2.0))
+        self._encode_batch_size = int(self.config.get("embeddings.encode_batch_size", 64))
+        # High-water mark for queued rows. Past it the caller encodes the
+        # backlog itself, so a slow encoder throttles ingest instead of
+        # growing memory. Rows are already in SQLite when they are queued;
+        # a crash loses up to this many plus the encoded batches waiting on
+        # the writer from the semantic index (close() reports what it flushes).
+        self._max_pending = int(
+            self.config.get("embeddings.max_pending_rows", 4 * self._write_batch_size)
+        )
+        self._pending: Deque[Tuple[List[str], List[str], List[Dict[str, Any]]]] = deque()
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+        # _work_event wakes an idle encoder when rows arrive; _flush_event
+        # cuts the batching interval short (batch full or shutting down)
+        self._work_event = threading.Event()
+        self._flush_event = threading.Event()
+        self._stop_event = threading.Event()
+        # Encoded batches waiting for the upsert thread; bounded for backpressure
+        self._encoded: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=4)
+        self._encoder_thread: Optional[threading.Thread] = None
+        self._upsert_thread: Optional[threading.Thread] = None
+        self._closed = False
+        
+        # Ingest filtering: drop OCR fragments and repeated texts
+        self._min_chars = int(self.config.get("embeddings.min_chars", 4))
+        self._dedupe = bool(self.config.get("embeddings.dedupe", True))
+        self._dedupe_across_frames = bool(self.config.get("embeddings.dedupe_across_frames", False))
+        self._recent_digests_size = int(self.config.get("embeddings.dedupe_cache_size", 100_000))
+        self._recent_digests: "OrderedDict[bytes, None]" = OrderedDict()
+        self._index_stats = {
+            "blocks_seen": 0,
+            "blocks_indexed": 0,
+            "skipped_short": 0,
+            "skipped_duplicate": 0,
+        }
+        
+        self._query_cache_size = int(self.config.get("embeddings.query_cache_size", 512))
+        
         # Provider selection
         self.provider = self.config.get("embeddings.provider", "sbert")
 
-        # Embedding backends
-        self._sbert_model: Optional[SentenceTransformer] = None
+        # Embedding backends; the sbert model and Chroma are opened on first use
+        self._sbert_model: Optional["SentenceTransformer"] = None
         self._openai_client = None
         self._openai_model = None
+        self._client = None
+        self._collection = None
+        self._init_lock = threading.RLock()
+
+        # The backends load lazily, so check up front that they can be
+        # imported at all; callers treat a failed constructor as "disabled"
+        required = ["chromadb"] + (["sentence_transformers"] if self.provider == "sbert" else [])
+        missing = [name for name in required if importlib.util.find_spec(name) is None]
+        if missing:
+            raise RuntimeError(f"embedding dependencies not installed: {', '.join(missing)}")
 
-        # Initialize embedding backend lazily
         if self.provider == "sbert":
-            model_name = self.config.get(
+            self._sbert_model_name = self.config.get(
                 "embeddings.model", "sentence-transformers/all-MiniLM-L6-v2"
             )
-            logger.info("loading_embedding_model", provider="sbert", model=model_name)
-            self._sbert_model = SentenceTransformer(model_name)
+            self._model_key: Tuple[str, ...] = (
+                "sbert",
+                self._sbert_model_name,
+                str(self.config.get("embeddings.backend", "torch")),
+                str(self.config.get("embeddings.dtype", "fp32")),
+            )
         elif self.provider == "openai":
             if OpenAIClient is None:
                 raise RuntimeError("openai client library not available; install openai")
@@ -68,30 +196,13 @@ class EmbeddingService:
             self._openai_model = self.config.get(
                 "embeddings.openai_model", "text-embedding-3-small"
             )
+            self._model_key = ("openai", self._openai_model)
             logger.info(
                 "loading_embedding_model", provider="openai", model=self._openai_model
             )
         else:
             raise ValueError(f"Unknown embeddings.provider: {self.provider}")
         
-        # Initialize Chroma client
-        chroma_dir = self.config.get_embeddings_dir()
-        chroma_dir.mkdir(parents=True, exist_ok=True)
-        
-        self.client = chromadb.PersistentClient(
-            path=str(chroma_dir),
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=False,
-            )
-        )
-        
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name="text_blocks",
-            metadata={"hnsw:space": "cosine"}
-        )
-
         # Optional reranker (lazy-init when actually used)
         self.reranker_enabled = bool(self.config.get("embeddings.reranker_enabled", False))
         self.reranker_model_name = self.config.get(
@@ -102,10 +213,196 @@ class EmbeddingService:
         logger.info(
             "embedding_service_initialized",
             provider=self.provider,
-            collection_count=self.collection.count(),
             reranker=self.reranker_enabled,
         )
 
+    @property
+    def model(self) -> "SentenceTransformer":
+        """SentenceTransformer model, loaded on first encode."""
+        if self._sbert_model is None:
+            with self._init_lock:
+                if self._sbert_model is None:
+                    backend = self.config.get("embeddings.backend", "torch")
+                    logger.info(
+                        "loading_embedding_model",
+                        provider="sbert",
+                        model=self._sbert_model_name,
+                        backend=backend,
+                    )
+                    try:
+                        self._sbert_model = self._load_sbert_model(self._sbert_model_name, backend)
+                    except Exception as e:
+                        self._disable(e)
+                        raise
+        return self._sbert_model
+
+    @property
+    def client(self):
+        """Persistent Chroma client, opened on first use."""
+        if self._client is None:
+            with self._init_lock:
+                if self._client is None:
+                    try:
+                        import chromadb
+                        from chromadb.config import Settings
+
+                        chroma_dir = self.config.get_embeddings_dir()
+                        chroma_dir.mkdir(parents=True, exist_ok=True)
+                        self._client = chromadb.PersistentClient(
+                            path=str(chroma_dir),
+                            settings=Settings(
+                                anonymized_telemetry=False,
+                                allow_reset=False,
+                            )
+                        )
+                    except Exception as e:
+                        self._disable(e)
+                        raise
+        return self._client
+
+    def _disable(self, error: Exception) -> None:
+        """Stop accepting new rows after a backend failed to load.
+        
+        Loading is deferred to the first encode, which usually happens on the
+        background encoder thread; without this every later batch would fail
+        there and be dropped one log line at a time.
+        """
+        if self.enabled:
+            self.enabled = False
+            logger.warning("embedding_service_disabled", reason=str(error))
+
+    @property
+    def collection(self):
+        """The text block collection, opened (or created) on first use."""
+        if self._collection is None:
+            with self._init_lock:
+                if self._collection is None:
+                    self._collection = self._open_collection("text_blocks")
+        return self._collection
+
+    def _open_collection(self, name: str):
+        """Open the collection, creating it with tuned HNSW parameters if missing.
+        
+        Index parameters only take effect at creation time, so an existing
+        collection is opened as-is rather than having its metadata rewritten.
+        """
+        try:
+            return self.client.get_collection(name=name)
+        except Exception:
+            pass
+        
+        hnsw = {**DEFAULT_HNSW_PARAMS, **(self.config.get("embeddings.hnsw") or {})}
+        metadata = {f"hnsw:{key}": value for key, value in hnsw.items()}
+        logger.info("creating_embedding_collection", name=name, metadata=metadata)
+        return self.client.get_or_create_collection(name=name, metadata=metadata)
+
+    def _load_sbert_model(self, model_name: str, backend: str) -> "SentenceTransformer":
+        """Load a SentenceTransformer on the configured inference backend.
+        
+        Args:
+            model_name: Hugging Face model id or local path
+            backend: 'torch', 'onnx', or 'onnx-quantized' (INT8 dynamic quantization)
+            
+        Returns:
+            Loaded model; falls back to torch if the ONNX backend is unavailable
+        """
+        from sentence_transformers import SentenceTransformer
+
+        if backend == "torch":
+            device, model_kwargs = self._torch_device_and_dtype()
+            if device is None:
+                # torch's intra-op pool is process-wide, so only resize it
+                # when explicitly asked to (e.g. to leave a core for the
+                # Chroma writer thread in the capture daemon)
+                num_threads = self.config.get("embeddings.num_threads")
+                if num_threads:
+                    import torch
+
+                    torch.set_num_threads(max(1, int(num_threads)))
+                return SentenceTransformer(model_name)
+            return SentenceTransformer(model_name, device=device, model_kwargs=model_kwargs)
+        if backend not in ("onnx", "onnx-quantized"):
+            raise ValueError(f"Unknown embeddings.backend: {backend}")
+        
+        try:
+            model_kwargs: Dict[str, Any] = {
+                "provider": "CPUExecutionProvider",
+                "session_options": self._ort_session_options(),
+            }
+            if backend == "onnx":
+                return SentenceTransformer(model_name, backend="onnx", model_kwargs=model_kwargs)
+            
+            qconfig = self.config.get("embeddings.onnx_quantization") or _default_quantization_config()
+            if qconfig not in _ONNX_QUANTIZED_FILES:
+                raise ValueError(f"Unknown embeddings.onnx_quantization: {qconfig}")
+            model_kwargs["file_name"] = _ONNX_QUANTIZED_FILES[qconfig]
+            try:
+                # Many hub models (incl. all-MiniLM-L6-v2) ship pre-quantized files
+                return SentenceTransformer(model_name, backend="onnx", model_kwargs=model_kwargs)
+            except Exception:
+                return self._load_exported_quantized_model(model_name, qconfig, model_kwargs)
+        except Exception as e:
+            logger.warning("onnx_backend_unavailable_using_torch", backend=backend, error=str(e))
+            return SentenceTransformer(model_name)
+
+    def _ort_session_options(self):
+        """ONNX Runtime session options sized for MiniLM-scale matmuls.
+        
+        Small GEMMs stop scaling past a few threads, so intra-op threads are
+        capped (embeddings.onnx_threads, default min(4, cores)).
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = int(
+            self.config.get("embeddings.onnx_threads") or min(4, os.cpu_count() or 1)
+        )
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.enable_cpu_mem_arena = True
+        return options
+
+    def _torch_device_and_dtype(self) -> tuple[Optional[str], Dict[str, Any]]:
+        """Choose an accelerator and the dtype set in embeddings.dtype.
+        
+        Defaults to fp32: half precision shifts the vectors slightly, so it
+        must be opted into (ideally before building an index) rather than
+        switched on because an accelerator happens to be present. It is only
+        applied on CUDA/MPS; CPU inference stays fp32.
+        
+        Returns:
+            (device or None for CPU default, model_kwargs for SentenceTransformer)
+        """
+        import torch
+
+        if torch.cuda.is_available():
+            device = "cuda"
+        elif torch.backends.mps.is_available():
+            device = "mps"
+        else:
+            return None, {}
+        
+        dtype = self.config.get("embeddings.dtype", "fp32")
+        torch_dtype = {"fp32": "float32", "fp16": "float16", "bf16": "bfloat16"}.get(dtype)
+        if torch_dtype is None:
+            raise ValueError(f"Unknown embeddings.dtype: {dtype}")
+        return device, {"torch_dtype": torch_dtype}
+
+    def _load_exported_quantized_model(
+        self, model_name: str, qconfig: str, model_kwargs: Dict[str, Any]
+    ) -> "SentenceTransformer":
+        """Export an INT8 ONNX model once into the data dir and load it from there."""
+        from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+        local_dir = self.config.get_data_dir() / "onnx" / model_name.replace("/", "__")
+        if not (local_dir / model_kwargs["file_name"]).exists():
+            logger.info("exporting_quantized_onnx_model", model=model_name, quantization=qconfig)
+            onnx_model = SentenceTransformer(model_name, backend="onnx")
+            onnx_model.save(str(local_dir))
+            export_dynamic_quantized_onnx_model(onnx_model, qconfig, str(local_dir))
+        return SentenceTransformer(str(local_dir), backend="onnx", model_kwargs=model_kwargs)
+
     def _ensure_reranker_loaded(self) -> None:
         """Lazily load the reranker only if requested and enabled."""
         if not self.reranker_enabled or self._reranker is not None:
@@ -124,23 +421,52 @@ class EmbeddingService:
             logger.warning("reranker_init_failed", error=str(rerank_err))
             self.reranker_enabled = False
 
-    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Embed a batch of texts using configured provider."""
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts using configured provider.
+        
+        Returns:
+            L2-normalized float32 array of shape (len(texts), dim)
+        """
         if self.provider == "sbert":
-            assert self._sbert_model is not None
-            return self._sbert_model.encode(
-                texts, convert_to_numpy=True, show_progress_bar=False
-            ).tolist()
+            model = self.model
+            with _model_lock:
+                embeddings = model.encode(
+                    texts,
+                    batch_size=self._encode_batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False,
+                )
+            return embeddings.astype(np.float32, copy=False)
         elif self.provider == "openai":
             assert self._openai_client is not None and self._openai_model is not None
             # OpenAI embeddings API expects list of inputs; returns data[].embedding
             resp = self._openai_client.embeddings.create(
                 input=texts, model=self._openai_model
             )
-            return [d.embedding for d in resp.data]
+            embeddings = np.asarray([d.embedding for d in resp.data], dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            return embeddings / np.maximum(norms, 1e-12)
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
     
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a search query, reusing recent results from the shared LRU cache."""
+        text = query.strip()
+        key = self._model_key + (text,)
+        with _query_cache_lock:
+            cached = _query_cache.get(key)
+            if cached is not None:
+                _query_cache.move_to_end(key)
+                return cached
+        
+        embedding = self._embed_texts([text])[0]
+        with _query_cache_lock:
+            _query_cache[key] = embedding
+            while len(_query_cache) > self._query_cache_size:
+                _query_cache.popitem(last=False)
+        return embedding
+
     def index_text_blocks(
         self,
         frame_metadata: Dict[str, Any],
@@ -164,14 +490,23 @@ class EmbeddingService:
             texts = []
             metadatas = []
             
+            seen_in_frame = set()
             for block in text_blocks:
-                block_id = str(block["block_id"])
                 text = block["text"]
+                stripped = text.strip() if text else ""
+                self._index_stats["blocks_seen"] += 1
                 
-                if not text or len(text.strip()) == 0:
+                # OCR fragments this short carry no searchable meaning
+                if len(stripped) < self._min_chars:
+                    self._index_stats["skipped_short"] += 1
                     continue
                 
-                ids.append(block_id)
+                if self._dedupe and self._is_duplicate(stripped, seen_in_frame):
+                    self._index_stats["skipped_duplicate"] += 1
+                    continue
+                
+                # Deterministic ids make re-indexing idempotent (upsert)
+                ids.append(f"{frame_metadata['frame_id']}:{block['block_id']}")
                 texts.append(text)
                 
                 # Include frame metadata with block
@@ -191,22 +526,11 @@ class EmbeddingService:
             if not ids:
                 return
             
-            # Generate embeddings
-            embeddings = self._embed_texts(texts)
-            
-            # Add to collection
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=texts,
-                metadatas=metadatas
-            )
+            self._index_stats["blocks_indexed"] += len(ids)
             
-            logger.debug(
-                "text_blocks_indexed",
-                frame_id=frame_metadata["frame_id"],
-                count=len(ids)
-            )
+            # Queue for the background writer, which encodes and adds many
+            # frames' blocks at once
+            self._enqueue(ids, texts, metadatas)
             
         except Exception as e:
             logger.error(
@@ -216,6 +540,185 @@ class EmbeddingService:
             )
             raise
     
+    def _is_duplicate(self, text: str, seen_in_frame: set) -> bool:
+        """Check (and record) whether text was already indexed for this frame.
+        
+        With embeddings.dedupe_across_frames, recently indexed texts from
+        other frames are skipped too; those frames then won't appear as
+        semantic matches for that text, so it is off by default.
+        """
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+        if digest in seen_in_frame:
+            return True
+        seen_in_frame.add(digest)
+        
+        if self._dedupe_across_frames:
+            if digest in self._recent_digests:
+                self._recent_digests.move_to_end(digest)
+                return True
+            self._recent_digests[digest] = None
+            if len(self._recent_digests) > self._recent_digests_size:
+                self._recent_digests.popitem(last=False)
+        return False
+
+    def _enqueue(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Queue prepared rows for the background encode/upsert pipeline.
+        
+        Raises:
+            RuntimeError: If the service has been closed
+        """
+        with self._pending_lock:
+            if self._closed:
+                raise RuntimeError("embedding service is closed")
+            self._pending.append((ids, texts, metadatas))
+            self._pending_count += len(ids)
+            batch_full = self._pending_count >= self._write_batch_size
+            backlog = self._pending_count if self._pending_count >= self._max_pending else 0
+            self._start_pipeline()
+        if backlog:
+            logger.warning("embedding_backlog_encoding_inline", pending=backlog)
+            self._encode_pending()
+            return
+        self._work_event.set()
+        if batch_full:
+            self._flush_event.set()
+
+    def _start_pipeline(self) -> None:
+        """Start whichever pipeline thread isn't running (caller holds _pending_lock)."""
+        if self._encoder_thread is None:
+            atexit.register(self.close)
+        if self._upsert_thread is None or not self._upsert_thread.is_alive():
+            self._upsert_thread = threading.Thread(
+                target=self._upsert_loop, name="embedding-writer", daemon=True
+            )
+            self._upsert_thread.start()
+        if self._encoder_thread is None or not self._encoder_thread.is_alive():
+            self._encoder_thread = threading.Thread(
+                target=self._encoder_loop, name="embedding-encoder", daemon=True
+            )
+            self._encoder_thread.start()
+
+    def _encoder_loop(self) -> None:
+        """Encode queued rows when a batch fills up or the interval elapses."""
+        while not self._stop_event.is_set():
+            # Sleep until rows arrive, then give the batch up to the interval to fill
+            self._work_event.wait()
+            self._work_event.clear()
+            self._flush_event.wait(self._write_interval)
+            self._flush_event.clear()
+            self._encode_pending()
+
+    def _upsert_loop(self) -> None:
+        """Write encoded batches to Chroma while the encoder works on the next."""
+        while True:
+            item = self._encoded.get()
+            try:
+                if item is None:
+                    return
+                self._upsert(*item)
+            finally:
+                self._encoded.task_done()
+
+    def _encode_pending(self) -> None:
+        """Take every queued row, encode them together and hand them to the writer.
+
+        The hand-off happens under _encode_lock, so once flush() gets the lock
+        every row drained before it is already on the writer queue.
+        """
+        with self._encode_lock:
+            with self._pending_lock:
+                batches = list(self._pending)
+                self._pending.clear()
+                self._pending_count = 0
+            if not batches or not self.enabled:
+                return
+            
+            ids: List[str] = []
+            texts: List[str] = []
+            metadatas: List[Dict[str, Any]] = []
+            for batch_ids, batch_texts, batch_metadatas in batches:
+                ids.extend(batch_ids)
+                texts.extend(batch_texts)
+                metadatas.extend(batch_metadatas)
+            
+            try:
+                # One encode across all frames; SentenceTransformer length-sorts
+                # internally so padding stays minimal
+                embeddings = self._embed_texts(texts)
+            except Exception as e:
+                logger.error("indexing_failed", stage="encode", count=len(ids), error=str(e))
+                return
+            
+            upsert_thread = self._upsert_thread
+            if upsert_thread is None or not upsert_thread.is_alive():
+                # Pipeline not running (never started or closed): write inline
+                self._upsert(ids, embeddings, texts, metadatas)
+            else:
+                # Blocks when the writer falls behind (bounded queue)
+                self._encoded.put((ids, embeddings, texts, metadatas))
+
+    def _upsert(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Upsert one encoded batch into the collection."""
+        try:
+            self.collection.upsert(
+                ids=ids,
+                embeddings=_to_chroma(embeddings),
+                documents=texts,
+                metadatas=metadatas
+            )
+            logger.debug("text_blocks_indexed", count=len(ids))
+        except Exception as e:
+            logger.error("indexing_failed", stage="upsert", count=len(ids), error=str(e))
+
+    def flush(self) -> None:
+        """Encode and write everything queued so far, returning once it is stored."""
+        if not self.enabled:
+            return
+        
+        self._encode_pending()
+        upsert_thread = self._upsert_thread
+        if upsert_thread is not None and upsert_thread.is_alive():
+            self._encoded.join()
+
+    def close(self) -> None:
+        """Stop the background pipeline and flush anything still queued.
+        
+        Indexing after close() raises; search and delete keep working.
+        """
+        if not hasattr(self, "_pending_lock"):
+            # Disabled in config
+            return
+        with self._pending_lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._encoder_thread is None:
+            # Nothing was ever queued
+            return
+        
+        with self._pending_lock:
+            pending = self._pending_count
+        logger.info("embedding_pipeline_closing", pending=pending, encoded=self._encoded.qsize())
+        self._stop_event.set()
+        self._work_event.set()
+        self._flush_event.set()
+        self._encoder_thread.join(timeout=30)
+        self.flush()
+        if self._upsert_thread is not None and self._upsert_thread.is_alive():
+            self._encoded.put(None)
+            self._upsert_thread.join(timeout=30)
+
     def search(
         self,
         query: str,
@@ -237,18 +740,24 @@ class EmbeddingService:
             return []
         
         try:
-            # Generate query embedding
-            query_embedding = self._embed_texts([query])[0]
+            # Generate query embedding (cached for repeated queries)
+            query_embedding = self._embed_query(query)
             
             # Build where filter if app_filter provided
             where = None
             if app_filter:
                 where = {"app_bundle_id": app_filter}
             
+            # Over-fetch a bounded candidate pool when reranking
+            if rerank:
+                self._ensure_reranker_loaded()
+            want_rerank = rerank and self.reranker_enabled and self._reranker is not None
+            n_results = max(limit, min(limit * 4, RERANK_MAX_CANDIDATES)) if want_rerank else limit
+            
             # Search collection
             results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=limit,
+                query_embeddings=_to_chroma(query_embedding[np.newaxis, :]),
+                n_results=n_results,
                 where=where,
                 include=["documents", "metadatas", "distances"]
             )
@@ -256,27 +765,29 @@ class EmbeddingService:
             # Format results
             matches: List[Dict[str, Any]] = []
             if results and results.get("ids") and len(results["ids"]) > 0:
-                for i, block_id in enumerate(results["ids"][0]):
+                for i, chroma_id in enumerate(results["ids"][0]):
+                    metadata = results["metadatas"][0][i]
                     matches.append({
-                        "block_id": block_id,  # keep as string id
-                        "frame_id": results["metadatas"][0][i]["frame_id"],
+                        # Chroma ids are "frame_id:block_id"; older entries used the bare block id
+                        "block_id": str(metadata.get("block_id", chroma_id)),
+                        "frame_id": metadata["frame_id"],
                         "text": results["documents"][0][i],
                         "distance": results["distances"][0][i],
-                        "metadata": results["metadatas"][0][i],
+                        "metadata": metadata,
                     })
 
             # Optional rerank using cross-encoder
-            if rerank:
-                self._ensure_reranker_loaded()
-            if rerank and self.reranker_enabled and self._reranker and matches:
-                pairs = [[query, m["text"]] for m in matches]
+            if want_rerank and matches:
                 try:
-                    scores = self._reranker.compute_score(pairs, normalize=True)
-                    for m, s in zip(matches, scores):
-                        m["rerank_score"] = float(s)
-                    matches.sort(key=lambda x: x.get("rerank_score", 0.0), reverse=True)
+                    scores = self._score_pairs(query, [m["text"] for m in matches])
+                    for m, s in zip(matches, scores.tolist()):
+                        m["rerank_score"] = s
+                    # Stable descending order without a per-item key function
+                    order = np.argsort(-scores, kind="stable")
+                    matches = [matches[i] for i in order]
                 except Exception as rerank_err:
                     logger.warning("rerank_failed", error=str(rerank_err))
+            matches = matches[:limit]
             
             logger.debug("semantic_search_completed", query=query, results=len(matches))
             
@@ -286,26 +797,26 @@ class EmbeddingService:
             logger.error("search_failed", query=query, error=str(e))
             return []
     
-    def delete_frame_blocks(self, frame_id: int) -> None:
+    def delete_frame_blocks(self, frame_id: int, verbose: bool = False) -> None:
         """Delete all text blocks for a frame.
         
         Args:
             frame_id: Frame ID to delete blocks for
+            verbose: Also count the matching rows first and log the count
+                (costs an extra lookup)
         """
         if not self.enabled:
             return
         
+        # Make sure queued rows for this frame don't land after the delete
+        self.flush()
+        
         try:
-            # Query for blocks belonging to this frame
-            results = self.collection.get(
-                where={"frame_id": frame_id},
-                include=[]
-            )
-            
-            if results and results["ids"]:
-                self.collection.delete(ids=results["ids"])
-                logger.debug("frame_blocks_deleted", frame_id=frame_id, count=len(results["ids"]))
-                
+            count = None
+            if verbose:
+                count = len(self.collection.get(where={"frame_id": frame_id}, include=[])["ids"])
+            self.collection.delete(where={"frame_id": frame_id})
+            logger.debug("frame_blocks_deleted", frame_id=frame_id, count=count)
         except Exception as e:
             logger.error("delete_failed", frame_id=frame_id, error=str(e))
     
@@ -320,25 +831,40 @@ class EmbeddingService:
         
         return {
             "enabled": True,
-            "total_embeddings": self.collection.count(),
+            # Don't open Chroma just to report stats
+            "total_embeddings": self._collection.count() if self._collection is not None else None,
             "provider": self.provider,
             "model": self.config.get("embeddings.model") if self.provider == "sbert" else self._openai_model,
             "reranker": self.reranker_enabled,
             "reranker_model": self.reranker_model_name if self.reranker_enabled else None,
+            "indexing": dict(self._index_stats),
         }
 
-    def rerank(self, query: str, texts: List[str]) -> List[float]:
+    def _score_pairs(self, query: str, texts: List[str], max_length: Optional[int] = None) -> np.ndarray:
+        """Score all (query, text) pairs in a single cross-encoder batch."""
+        pairs = [[query, t] for t in texts]
+        kwargs: Dict[str, Any] = {"normalize": True, "batch_size": max(len(pairs), 1)}
+        if max_length is None:
+            max_length = self.config.get("embeddings.reranker_max_length")
+        if max_length:
+            kwargs["max_length"] = int(max_length)
+        scores = self._reranker.compute_score(pairs, **kwargs)
+        # FlagReranker returns a bare float for a single pair
+        return np.atleast_1d(np.asarray(scores, dtype=np.float32))
+
+    def rerank(self, query: str, texts: List[str], max_length: Optional[int] = None) -> List[float]:
         """Compute rerank scores for query over a list of texts.
 
         Returns a list of scores aligned with texts.
         """
+        self._ensure_reranker_loaded()
         if not (self.reranker_enabled and self._reranker):
             logger.warning("rerank_called_but_disabled")
             return [0.0 for _ in texts]
-        pairs = [[query, t] for t in texts]
+        if not texts:
+            return []
         try:
-            scores = self._reranker.compute_score(pairs, normalize=True)
-            return [float(s) for s in scores]
+            return self._score_pairs(query, texts, max_length=max_length).tolist()
         except Exception as e:
             logger.warning("rerank_compute_failed", error=str(e))
             return [0.0 for _ in texts]
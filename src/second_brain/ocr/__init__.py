@@ -1,11 +1,26 @@
 """OCR module for Second Brain.
 
 Uses Apple Vision framework for local, fast, free OCR.
+
+The backend is imported on first attribute access (PEP 562) so that importing
+this package doesn't load the PyObjC Vision/Quartz bridges until OCR is used.
 """
 
-from .apple_vision_ocr import AppleVisionOCR
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .apple_vision_ocr import AppleVisionOCR
 
-# Default OCR is Apple Vision (local, fast, free)
-OCR = AppleVisionOCR
+    # Default OCR is Apple Vision (local, fast, free)
+    OCR = AppleVisionOCR
 
 __all__ = ["AppleVisionOCR", "OCR"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("AppleVisionOCR", "OCR"):
+        from .apple_vision_ocr import AppleVisionOCR
+
+        globals().update(AppleVisionOCR=AppleVisionOCR, OCR=AppleVisionOCR)
+        return AppleVisionOCR
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
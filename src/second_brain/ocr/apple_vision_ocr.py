@@ -1,25 +1,48 @@
 """Apple Vision framework OCR implementation for macOS."""
 
 import asyncio
+import hashlib
+import re
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 from Quartz import (
+    CGImageSourceCreateWithData,
     CGImageSourceCreateWithURL,
     CGImageSourceCreateImageAtIndex,
+    CGImageSourceCreateThumbnailAtIndex,
+    kCGImageSourceCreateThumbnailFromImageAlways,
+    kCGImageSourceCreateThumbnailWithTransform,
+    kCGImageSourceThumbnailMaxPixelSize,
 )
 from Vision import (
     VNRecognizeTextRequest,
     VNImageRequestHandler,
 )
-from Foundation import NSURL
+from Foundation import NSData, NSURL
 
 from ..config import Config
 
 logger = structlog.get_logger()
 
+# Runs of spaces and of 3+ newlines, collapsed in a single scan. Single
+# spaces and paragraph breaks already are normal and aren't matched.
+_EXCESS_WHITESPACE_RE = re.compile(r" {2,}|\n{3,}")
+
+
+def _collapse_whitespace(match: "re.Match[str]") -> str:
+    return " " if match.group()[0] == " " else "\n\n"
+
+
+# Substrings used by _determine_block_type to classify content
+_CODE_INDICATORS = ('def ', 'class ', 'import ', 'function ', 'const ', 'let ', 'var ', '{', '}', '=>')
+_TERMINAL_INDICATORS = ('$', '>', '~/', 'bash', 'zsh', 'python')
+
 
 class AppleVisionOCR:
     """OCR service using Apple's Vision framework (local, fast, free)."""
@@ -36,6 +59,34 @@ class AppleVisionOCR:
         self.recognition_level = self.config.get("ocr.recognition_level", "accurate")  # "fast" or "accurate"
         self.include_semantic_context = self.config.get("ocr.include_semantic_context", False)
         
+        # Optional cap on the longest image side before recognition. Off by
+        # default: small UI text on Retina captures needs the full resolution.
+        max_dim = self.config.get("ocr.max_image_dim")
+        self._thumbnail_options = (
+            {
+                kCGImageSourceCreateThumbnailFromImageAlways: True,
+                kCGImageSourceCreateThumbnailWithTransform: True,
+                kCGImageSourceThumbnailMaxPixelSize: int(max_dim),
+            }
+            if max_dim
+            else None
+        )
+        
+        # Recognized lines keyed by a hash of the image file, so byte-identical
+        # frames (static screens the frame differ let through) skip Vision
+        self._cache_size = int(self.config.get("ocr.cache_size", 512))
+        self._cache: "OrderedDict[bytes, List[Tuple[str, float]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Bound on frames recognized at once; Vision requests are CPU/ANE heavy.
+        # A dedicated pool keeps OCR from starving other default-executor work
+        # (embedding close, summaries) and vice versa.
+        max_concurrent = max(1, int(self.config.get("ocr.max_concurrent", 4)))
+        self._concurrency = asyncio.Semaphore(max_concurrent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent, thread_name_prefix="apple-vision-ocr"
+        )
+        
         logger.info(
             "apple_vision_ocr_initialized",
             recognition_level=self.recognition_level,
@@ -43,27 +94,68 @@ class AppleVisionOCR:
             cost="free"
         )
 
-    def _perform_ocr_sync(self, image_path: Path) -> List[str]:
+    def _ocr_file_sync(self, image_path: Path) -> List[Tuple[str, float]]:
+        """Run OCR on an image file, reusing results for identical content.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            List of (text, confidence) tuples
+        """
+        if self._cache_size <= 0:
+            return self._perform_ocr_sync(image_path)
+        
+        data = image_path.read_bytes()
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+        
+        # Decode from the bytes already in memory rather than reading the file again
+        text_lines = self._perform_ocr_sync(image_path, data)
+        # Failures come back empty too; don't pin them in the cache
+        if text_lines:
+            with self._cache_lock:
+                self._cache[key] = text_lines
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return text_lines
+
+    def _perform_ocr_sync(
+        self, image_path: Path, data: Optional[bytes] = None
+    ) -> List[Tuple[str, float]]:
         """Perform OCR synchronously using Vision framework.
         
         Args:
             image_path: Path to image file
+            data: The file's contents, if already read; decoded in place of the file
             
         Returns:
-            List of recognized text strings
+            List of (text, confidence) tuples
         """
         try:
-            # Create URL from path
-            url = NSURL.fileURLWithPath_(str(image_path))
-            
             # Create image source
-            image_source = CGImageSourceCreateWithURL(url, None)
+            if data is not None:
+                image_source = CGImageSourceCreateWithData(
+                    NSData.dataWithBytes_length_(data, len(data)), None
+                )
+            else:
+                url = NSURL.fileURLWithPath_(str(image_path))
+                image_source = CGImageSourceCreateWithURL(url, None)
             if not image_source:
                 logger.error("failed_to_create_image_source", path=str(image_path))
                 return []
             
-            # Get CGImage
-            cg_image = CGImageSourceCreateImageAtIndex(image_source, 0, None)
+            # Get CGImage, downscaled while decoding if a max dimension is set
+            if self._thumbnail_options is not None:
+                cg_image = CGImageSourceCreateThumbnailAtIndex(
+                    image_source, 0, self._thumbnail_options
+                )
+            else:
+                cg_image = CGImageSourceCreateImageAtIndex(image_source, 0, None)
             if not cg_image:
                 logger.error("failed_to_get_cgimage", path=str(image_path))
                 return []
@@ -125,64 +217,78 @@ class AppleVisionOCR:
             return []
         
         try:
-            # Run OCR in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            text_lines = await loop.run_in_executor(
-                None,
-                self._perform_ocr_sync,
-                image_path
+            # Recognition and text post-processing (joins, regex normalization,
+            # block classification) all run on the OCR pool, off the event loop
+            async with self._concurrency:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor,
+                    self._extract_text_sync,
+                    image_path,
+                    frame_id,
+                )
+        except Exception as e:
+            logger.error(
+                "ocr_failed",
+                frame_id=frame_id,
+                error=str(e),
             )
+            return []
+
+    def _extract_text_sync(self, image_path: Path, frame_id: str) -> List[Dict[str, Any]]:
+        """Recognize an image and build its text block (runs on the OCR pool).
+        
+        Args:
+            image_path: Path to image file
+            frame_id: Frame identifier
             
-            if not text_lines:
-                logger.debug("no_text_found", frame_id=frame_id)
-                return []
+        Returns:
+            List of text block dictionaries
+        """
+        text_lines = self._ocr_file_sync(image_path)
+        
+        if not text_lines:
+            logger.debug("no_text_found", frame_id=frame_id)
+            return []
 
-            # Extract text strings and confidences
-            texts = [line[0] for line in text_lines]
-            confidences = [line[1] for line in text_lines]
+        # Extract text strings and confidences
+        texts = [line[0] for line in text_lines]
+        confidences = [line[1] for line in text_lines]
 
-            # Combine all text lines
-            full_text = "\n".join(texts)
+        # Combine all text lines
+        full_text = "\n".join(texts)
 
-            # Calculate average confidence across all text lines (don't use fake fallback)
-            avg_confidence = sum(confidences) / len(confidences) if confidences else None
+        # Calculate average confidence across all text lines (don't use fake fallback)
+        avg_confidence = sum(confidences) / len(confidences) if confidences else None
 
-            # Normalize text
-            normalized_text = self._normalize_text(full_text)
+        # Normalize text
+        normalized_text = self._normalize_text(full_text)
 
-            # Determine block type based on content
-            block_type = self._determine_block_type(full_text)
+        # Determine block type based on content
+        block_type = self._determine_block_type(full_text)
 
-            # Create text block
-            text_block = {
-                "block_id": str(uuid.uuid4()),
-                "frame_id": frame_id,
-                "text": full_text,
-                "normalized_text": normalized_text,
-                "confidence": round(avg_confidence, 4) if avg_confidence is not None else None,  # Actual confidence from Vision framework
-                "block_type": block_type,
-            }
-            
-            if self.include_semantic_context:
-                text_block["semantic_context"] = f"Screen capture with {len(text_lines)} text lines"
-            
-            logger.info(
-                "ocr_completed",
-                frame_id=frame_id,
-                text_length=len(full_text),
-                lines=len(text_lines),
-                block_type=block_type,
-            )
-            
-            return [text_block]
-            
-        except Exception as e:
-            logger.error(
-                "ocr_failed",
-                frame_id=frame_id,
-                error=str(e),
-            )
-            return []
+        # Create text block
+        text_block = {
+            "block_id": uuid.uuid4().hex,
+            "frame_id": frame_id,
+            "text": full_text,
+            "normalized_text": normalized_text,
+            "confidence": round(avg_confidence, 4) if avg_confidence is not None else None,  # Actual confidence from Vision framework
+            "block_type": block_type,
+        }
+        
+        if self.include_semantic_context:
+            text_block["semantic_context"] = f"Screen capture with {len(text_lines)} text lines"
+        
+        logger.info(
+            "ocr_completed",
+            frame_id=frame_id,
+            text_length=len(full_text),
+            lines=len(text_lines),
+            block_type=block_type,
+        )
+        
+        return [text_block]
 
     def _determine_block_type(self, text: str) -> str:
         """Determine the type of content based on text patterns.
@@ -197,15 +303,13 @@ class AppleVisionOCR:
         lines = text.split('\n')
         
         # Check for code patterns
-        code_indicators = ['def ', 'class ', 'import ', 'function ', 'const ', 'let ', 'var ', '{', '}', '=>']
-        code_count = sum(1 for line in lines if any(indicator in line for indicator in code_indicators))
+        code_count = sum(1 for line in lines if any(indicator in line for indicator in _CODE_INDICATORS))
         
         if code_count > len(lines) * 0.3:
             return "code"
         
         # Check for terminal patterns
-        terminal_indicators = ['$', '>', '~/', 'bash', 'zsh', 'python']
-        terminal_count = sum(1 for line in lines if any(indicator in line for indicator in terminal_indicators))
+        terminal_count = sum(1 for line in lines if any(indicator in line for indicator in _TERMINAL_INDICATORS))
         
         if terminal_count > len(lines) * 0.2:
             return "terminal"
@@ -227,13 +331,8 @@ class AppleVisionOCR:
         Returns:
             Normalized text
         """
-        import re
-        
-        # Remove multiple spaces
-        text = re.sub(r' +', ' ', text)
-        
-        # Remove multiple newlines (but keep paragraph breaks)
-        text = re.sub(r'\n\n+', '\n\n', text)
+        # Remove multiple spaces and newlines (but keep paragraph breaks)
+        text = _EXCESS_WHITESPACE_RE.sub(_collapse_whitespace, text)
         
         # Strip leading/trailing whitespace
         text = text.strip()
@@ -251,20 +350,24 @@ class AppleVisionOCR:
         Returns:
             List of text block lists (one per image)
         """
+        # Frames run concurrently, bounded by the ocr.max_concurrent semaphore
+        outcomes = await asyncio.gather(
+            *(self.extract_text(image_path, frame_id) for image_path, frame_id in image_paths),
+            return_exceptions=True,
+        )
         results = []
-        for image_path, frame_id in image_paths:
-            try:
-                result = await self.extract_text(image_path, frame_id)
-                results.append(result)
-            except Exception as e:
+        for (_, frame_id), outcome in zip(image_paths, outcomes):
+            if isinstance(outcome, BaseException):
                 logger.error(
                     "batch_processing_error",
                     frame_id=frame_id,
-                    error=str(e),
+                    error=str(outcome),
                 )
                 results.append([])
+            else:
+                results.append(outcome)
         return results
 
     async def close(self) -> None:
-        """Cleanup (no resources to release for local OCR)."""
-        pass
+        """Shut down the OCR worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
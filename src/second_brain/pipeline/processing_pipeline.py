@@ -49,6 +49,9 @@ class ProcessingPipeline:
         
         # OCR queue
         self.ocr_queue: deque = deque()
+        # Set when frames are queued (or on stop) so the OCR loop can idle
+        # without polling
+        self._ocr_ready = asyncio.Event()
         self.batch_size = self.config.get("ocr.batch_size", 5)
         
         # State
@@ -83,6 +86,7 @@ class ProcessingPipeline:
                 # Add to OCR queue
                 frame_path = self.config.get_frames_dir() / metadata["file_path"]
                 self.ocr_queue.append((frame_path, metadata))
+                self._ocr_ready.set()
                 self.stats["frames_captured"] += 1
                 self.stats["ocr_queue_size"] = len(self.ocr_queue)
                 
@@ -108,7 +112,8 @@ class ProcessingPipeline:
         while self.running or len(self.ocr_queue) > 0:
             # Wait if queue is empty
             if len(self.ocr_queue) == 0:
-                await asyncio.sleep(0.5)
+                self._ocr_ready.clear()
+                await self._ocr_ready.wait()
                 continue
             
             # Collect batch
@@ -216,6 +221,8 @@ class ProcessingPipeline:
         
         logger.info("stopping_processing_pipeline")
         self.running = False
+        # Wake an idle OCR loop so it can drain and exit
+        self._ocr_ready.set()
         
         # Stop summarization service
         if self.summarization_service:
@@ -243,6 +250,13 @@ class ProcessingPipeline:
             except Exception as error:
                 logger.warning("summarization_service_close_failed", error=str(error))
 
+        if self.embedding_service:
+            try:
+                # Flushes queued embeddings; blocking, so keep it off the loop
+                await asyncio.to_thread(self.embedding_service.close)
+            except Exception as error:
+                logger.warning("embedding_service_close_failed", error=str(error))
+
         # Close database
         self.database.close()
         
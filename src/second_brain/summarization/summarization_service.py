@@ -36,8 +36,13 @@ class SummarizationService:
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment")
         
-        # Initialize OpenAI client
-        self.client = AsyncOpenAI(api_key=api_key)
+        # Initialize OpenAI client. The SDK retries 429/5xx/timeouts with
+        # jittered exponential backoff and honors Retry-After headers.
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=int(self.config.get("summarization.max_retries", 4)),
+            timeout=float(self.config.get("summarization.timeout_seconds", 120)),
+        )
         # Use configured model if provided; default to GPT-5
         self.model = self.config.get("summarization.model", "gpt-5")
         
@@ -0,0 +1,49 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from src.second_brain.config import Config
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Create isolated test configuration with temporary directories."""
+    data_dir = tmp_path / "second-brain"
+    frames_dir = data_dir / "frames"
+    database_dir = data_dir / "database"
+    embeddings_dir = data_dir / "embeddings"
+    logs_dir = data_dir / "logs"
+    config_dir = data_dir / "config"
+
+    monkeypatch.setattr(
+        Config,
+        "get_data_dir",
+        staticmethod(lambda: data_dir),
+    )
+    monkeypatch.setattr(
+        Config,
+        "get_frames_dir",
+        staticmethod(lambda: frames_dir),
+    )
+    monkeypatch.setattr(
+        Config,
+        "get_database_dir",
+        staticmethod(lambda: database_dir),
+    )
+    monkeypatch.setattr(
+        Config,
+        "get_embeddings_dir",
+        staticmethod(lambda: embeddings_dir),
+    )
+    monkeypatch.setattr(
+        Config,
+        "get_logs_dir",
+        staticmethod(lambda: logs_dir),
+    )
+
+    config_path = config_dir / "settings.json"
+    config = Config(config_path=config_path)
+    config.set("capture.fps", 1)
+    config.set("capture.max_disk_usage_gb", 100)
+    config.set("capture.min_free_space_gb", 10)
+    return config
@@ -0,0 +1,185 @@
+"""Tests for the timeline API server."""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.second_brain.api import server
+from src.second_brain.api.server import UIStaticFiles, _iso_timestamp
+from src.second_brain.database import Database
+
+
+@pytest.fixture
+def api_client(config, monkeypatch):
+    """Build API test clients on the isolated config, stubbing Database methods."""
+    monkeypatch.setattr(server, "config", config)
+
+    def make_client(**db_methods):
+        for name, fake in db_methods.items():
+            monkeypatch.setattr(Database, name, fake)
+        return TestClient(server.create_app())
+
+    return make_client
+
+
+@pytest.fixture
+def ui_client(tmp_path):
+    """Serve a fake built UI directory through UIStaticFiles."""
+    assets_dir = tmp_path / "assets"
+    assets_dir.mkdir()
+    (tmp_path / "index.html").write_text("<html></html>")
+    (assets_dir / "index-BqRZl3xQ.js").write_text("console.log('ui');")
+
+    app = FastAPI()
+    app.mount("/", UIStaticFiles(directory=str(tmp_path), html=True), name="timeline_ui")
+    return TestClient(app)
+
+
+def test_hashed_assets_are_immutable(ui_client):
+    """Test content-hashed bundle assets get a long-lived cache header."""
+    response = ui_client.get("/assets/index-BqRZl3xQ.js")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+
+def test_index_is_revalidated(ui_client):
+    """Test index.html is not marked immutable."""
+    response = ui_client.get("/")
+
+    assert response.status_code == 200
+    assert "immutable" not in response.headers.get("cache-control", "")
+
+
+def test_etag_returns_not_modified(ui_client):
+    """Test conditional requests are answered with 304."""
+    first = ui_client.get("/assets/index-BqRZl3xQ.js")
+    etag = first.headers["etag"]
+
+    second = ui_client.get("/assets/index-BqRZl3xQ.js", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+
+def test_cors_preflight_is_cacheable(api_client):
+    """Test preflight responses allow a local origin and can be cached."""
+    client = api_client()
+    response = client.options(
+        "/api/apps",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "GET",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert response.headers["access-control-max-age"] == "86400"
+
+
+def test_iso_timestamp_is_cached():
+    """Test repeated timestamps reuse the cached ISO string."""
+    _iso_timestamp.cache_clear()
+    first = _iso_timestamp(1700000000)
+    second = _iso_timestamp(1700000000)
+
+    assert first == datetime.fromtimestamp(1700000000).isoformat()
+    assert second is first
+    assert _iso_timestamp.cache_info().hits == 1
+
+
+def test_app_stats_are_cached(api_client):
+    """Test /api/apps reuses recent usage stats instead of rescanning."""
+    calls = []
+
+    def fake_stats(self, limit=10):
+        calls.append(limit)
+        return [{"app_name": "Editor", "frame_count": 3}]
+
+    client = api_client(get_app_usage_stats=fake_stats)
+
+    first = client.get("/api/apps?limit=5")
+    second = client.get("/api/apps?limit=5")
+    client.get("/api/apps?limit=10")
+
+    assert first.json() == second.json()
+    assert calls == [5, 10]
+
+
+def test_inverted_frame_range_skips_query(api_client):
+    """Test /api/frames answers an empty window without hitting the database."""
+    def fail(*args, **kwargs):
+        raise AssertionError("get_frames should not be called")
+
+    client = api_client(get_frames=fail)
+
+    response = client.get("/api/frames?start=200&end=100")
+
+    assert response.status_code == 200
+    assert response.json() == {"frames": []}
+
+
+def test_read_pool_is_closed_on_shutdown(api_client):
+    """Test pooled database connections are closed when the app shuts down."""
+    closed = []
+    real_close = Database.close
+
+    def tracking_close(self):
+        closed.append(self)
+        real_close(self)
+
+    client = api_client(close=tracking_close)
+    with client:
+        assert client.get("/api/frames?limit=1").status_code == 200
+        assert not closed
+
+    assert len(closed) == 1
+
+
+def test_frame_text_is_cached_once_ocr_is_done(api_client):
+    """Test OCR text is cached per frame, but not before blocks exist."""
+    blocks = []
+    calls = []
+
+    def fake_blocks(self, frame_id):
+        calls.append(frame_id)
+        return list(blocks)
+
+    client = api_client(
+        get_frame=lambda self, frame_id: {"frame_id": frame_id},
+        get_text_blocks_by_frame=fake_blocks,
+    )
+
+    assert client.get("/api/frames/f1/text").json()["blocks"] == []
+    blocks.append({"block_id": "b1", "text": "hello"})
+    assert client.get("/api/frames/f1/text").json()["blocks"] == blocks
+    assert client.get("/api/frames/f1/text").json()["blocks"] == blocks
+    assert calls == ["f1", "f1"]
+
+
+def test_deleted_frame_text_is_not_served_from_cache(api_client):
+    """Test cached OCR text is dropped once its frame is gone."""
+    frames = {"f1": {"frame_id": "f1"}}
+
+    client = api_client(
+        get_frame=lambda self, frame_id: frames.get(frame_id),
+        get_text_blocks_by_frame=lambda self, frame_id: [{"block_id": "b1", "text": "hello"}],
+    )
+
+    assert client.get("/api/frames/f1/text").status_code == 200
+    del frames["f1"]
+    assert client.get("/api/frames/f1/text").status_code == 404
+
+
+def test_module_app_is_shared(config, monkeypatch):
+    """Test the module-level app is built once and reused."""
+    monkeypatch.setattr(server, "config", config)
+    server.get_app.cache_clear()
+    try:
+        assert server.app is server.get_app()
+        assert server.get_app() is server.get_app()
+    finally:
+        server.get_app.cache_clear()
@@ -0,0 +1,98 @@
+"""Tests for CLI process helpers."""
+
+import os
+import subprocess
+import sys
+import threading
+from datetime import datetime
+
+import psutil
+import pytest
+
+from src.second_brain.cli import _fast_rmtree, _loop_factory, _parse_day, _process_alive, _read_pid_file, _wait_for_exit
+
+
+def test_process_alive_matches_create_time():
+    """Test the current process is alive with its own create time."""
+    create_time = psutil.Process(os.getpid()).create_time()
+
+    assert _process_alive(os.getpid(), create_time)
+    assert _process_alive(os.getpid(), None)
+
+
+def test_process_alive_rejects_reused_pid():
+    """Test a mismatched create time is treated as a different process."""
+    assert not _process_alive(os.getpid(), 1.0)
+
+
+def test_wait_for_exit_returns_when_process_exits():
+    """Test waiting on a short-lived process returns promptly."""
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    # Reap in the background so the PID doesn't linger as a zombie
+    threading.Thread(target=proc.wait, daemon=True).start()
+
+    assert _wait_for_exit(proc.pid, timeout=5.0)
+
+
+def test_read_pid_file_formats(tmp_path):
+    """Test PID files with and without a create time are parsed."""
+    pid_file = tmp_path / "second-brain.pid"
+
+    pid_file.write_text("1234:1700000000.5\n")
+    assert _read_pid_file(pid_file) == (1234, 1700000000.5)
+
+    pid_file.write_text("1234")
+    assert _read_pid_file(pid_file) == (1234, None)
+
+    pid_file.write_text("1234:garbage")
+    assert _read_pid_file(pid_file) == (1234, None)
+
+    pid_file.write_text("")
+    with pytest.raises(ValueError):
+        _read_pid_file(pid_file)
+
+
+def test_fast_rmtree_removes_nested_tree(tmp_path):
+    """Test the scandir-based removal handles nesting and symlinks."""
+    root = tmp_path / "frames"
+    (root / "2025" / "10" / "26").mkdir(parents=True)
+    (root / "2025" / "10" / "26" / "a.png").write_bytes(b"x")
+    (root / "top.json").write_text("{}")
+    outside = tmp_path / "keep.txt"
+    outside.write_text("keep")
+    (root / "link").symlink_to(outside)
+
+    _fast_rmtree(root)
+
+    assert not root.exists()
+    assert outside.exists()
+
+
+def test_fast_rmtree_only_unlinks_a_symlinked_root(tmp_path):
+    """Test a symlinked directory is unlinked without touching its target."""
+    target = tmp_path / "real-frames"
+    target.mkdir()
+    (target / "a.png").write_bytes(b"x")
+    root = tmp_path / "frames"
+    root.symlink_to(target, target_is_directory=True)
+
+    _fast_rmtree(root)
+
+    assert not os.path.lexists(root)
+    assert (target / "a.png").exists()
+
+
+def test_parse_day_is_strict():
+    """Test --from/--to dates must be plain YYYY-MM-DD."""
+    assert _parse_day("2025-10-20") == int(datetime(2025, 10, 20).timestamp())
+
+    for bad in ("2025-10-20T10:00", "20251020", "2025-13-01"):
+        with pytest.raises(ValueError):
+            _parse_day(bad)
+
+
+def test_loop_factory_can_be_disabled(monkeypatch):
+    """Test the stdlib event loop is used when uvloop is opted out."""
+    monkeypatch.setenv("SECOND_BRAIN_NO_UVLOOP", "1")
+
+    assert _loop_factory() is None
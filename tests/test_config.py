@@ -0,0 +1,117 @@
+"""Tests for configuration management."""
+
+import json
+
+import pytest
+
+from src.second_brain.config import DEFAULT_CONFIG, Config
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """Write a user settings file with one override at the default location."""
+    path = tmp_path / "config" / "settings.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"capture": {"fps": 2}}))
+    monkeypatch.setattr(Config, "get_default_config_path", staticmethod(lambda: path))
+    monkeypatch.setattr(Config, "get_cache_dir", staticmethod(lambda: tmp_path / "cache"))
+    return path
+
+
+def test_load_writes_and_reuses_cache(config_path, tmp_path):
+    """Test the merged config is cached in the cache dir and reused."""
+    config = Config(config_path)
+
+    assert config.get("capture.fps") == 2
+    assert config.cache_path.parent == tmp_path / "cache"
+    assert config.cache_path.exists()
+    assert not list(config.cache_path.parent.glob("*.tmp"))
+
+    cached = Config(config_path)
+    assert cached.config == config.config
+
+
+def test_other_config_paths_are_not_cached(config_path, tmp_path):
+    """Test a config file other than the app's own never gets a cache."""
+    other = tmp_path / "other.json"
+    other.write_text(json.dumps({"capture": {"fps": 4}}))
+
+    config = Config(other)
+
+    assert config.get("capture.fps") == 4
+    assert config.cache_path is None
+    assert not (tmp_path / "cache").exists()
+
+
+def test_corrupt_cache_is_rebuilt(config_path):
+    """Test a truncated cache file is discarded and rewritten."""
+    config = Config(config_path)
+    intact = config.cache_path.read_bytes()
+    config.cache_path.write_bytes(intact[:-8])
+
+    reloaded = Config(config_path)
+
+    assert reloaded.get("capture.fps") == 2
+    assert config.cache_path.read_bytes() == intact
+
+
+def test_save_invalidates_cache(config_path):
+    """Test saving drops the cache so the next load sees the new value."""
+    config = Config(config_path)
+    config.set("capture.fps", 5)
+    config.save()
+
+    assert not config.cache_path.exists()
+    assert not list(config_path.parent.glob("*.tmp"))
+    assert Config(config_path).get("capture.fps") == 5
+
+
+def test_deep_merge_nested(tmp_path):
+    """Test nested dicts merge key-by-key and non-dicts replace."""
+    config = Config(tmp_path / "settings.json")
+    base = {"a": {"b": {"c": 1, "d": 2}, "e": 3}, "f": {"g": 4}}
+    update = {"a": {"b": {"c": 10}, "e": {"x": 1}}, "f": 5, "h": {"i": 6}}
+
+    config._deep_merge(base, update)
+
+    assert base == {"a": {"b": {"c": 10, "d": 2}, "e": {"x": 1}}, "f": 5, "h": {"i": 6}}
+
+
+def test_ensure_directories(tmp_path, monkeypatch):
+    """Test all standard directories are created."""
+    data_dir = tmp_path / "second-brain"
+    monkeypatch.setattr(Config, "get_data_dir", staticmethod(lambda: data_dir))
+    monkeypatch.setattr(Config, "get_frames_dir", staticmethod(lambda: data_dir / "frames"))
+    monkeypatch.setattr(Config, "get_database_dir", staticmethod(lambda: data_dir / "database"))
+    monkeypatch.setattr(Config, "get_embeddings_dir", staticmethod(lambda: data_dir / "embeddings"))
+    monkeypatch.setattr(Config, "get_logs_dir", staticmethod(lambda: data_dir / "logs"))
+    config = Config(data_dir / "config" / "settings.json")
+
+    config.ensure_directories()
+    config.ensure_directories()
+
+    for name in ("frames", "database", "embeddings", "logs", "config"):
+        assert (data_dir / name).is_dir()
+
+
+def test_instances_do_not_share_defaults(tmp_path):
+    """Test mutating one config does not leak into DEFAULT_CONFIG or others."""
+    first = Config(tmp_path / "a.json")
+    first.set("capture.fps", 42)
+
+    second = Config(tmp_path / "b.json")
+
+    assert DEFAULT_CONFIG["capture"]["fps"] == 1
+    assert second.get("capture.fps") == 1
+
+
+def test_large_settings_file_is_parsed(tmp_path):
+    """Test settings files above the mmap threshold load correctly."""
+    path = tmp_path / "settings.json"
+    padding = {f"key_{i}": "x" * 64 for i in range(2000)}
+    path.write_text(json.dumps({"capture": {"fps": 3}, "extra": padding}))
+
+    config = Config(path)
+
+    assert config.get("capture.fps") == 3
+    assert config.get("extra.key_1999") == "x" * 64
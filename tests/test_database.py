@@ -1,6 +1,7 @@
 """Tests for database layer."""
 
 import pytest
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -120,6 +121,10 @@ def test_search_text(temp_db):
     results = temp_db.search_text("python")
     assert len(results) > 0
     assert "python" in results[0]["text"].lower()
+    
+    # Truncate in SQL when only a snippet is needed
+    results = temp_db.search_text("python", app_filter="com.test.app", text_limit=6)
+    assert results[0]["text"] == "Python"
 
 
 def test_window_tracking(temp_db):
@@ -157,3 +162,42 @@ def test_cleanup_old_frames(temp_db):
     # Verify frame was deleted
     frame = temp_db.get_frame("old-frame")
     assert frame is None
+
+
+def test_read_only_connection_rejects_writes(temp_db):
+    """Test read-only handles can query but not modify the database."""
+    reader = Database(db_path=temp_db.db_path, read_only=True)
+    try:
+        assert reader.get_database_stats()["frame_count"] == 0
+        with pytest.raises(sqlite3.OperationalError):
+            reader.update_window_tracking("com.test.app", "Test App", 1234567890)
+    finally:
+        reader.close()
+
+
+def test_bulk_lookups(temp_db):
+    """Test fetching frames and text blocks by ID in bulk."""
+    for i in range(3):
+        temp_db.insert_frame({
+            "frame_id": f"frame-{i}",
+            "timestamp": 1234567890 + i,
+            "file_path": f"2025/10/26/{i}.png",
+        })
+    temp_db.insert_text_blocks([
+        {"block_id": f"block-{i}", "frame_id": f"frame-{i}", "text": f"text {i}"}
+        for i in range(3)
+    ])
+
+    frames = temp_db.get_frames_bulk(["frame-2", "frame-0", "frame-0", "missing"])
+    assert set(frames) == {"frame-0", "frame-2"}
+    assert frames["frame-2"]["timestamp"] == 1234567892
+
+    blocks = temp_db.get_text_blocks_bulk(["block-1", "missing"])
+    assert list(blocks) == ["block-1"]
+    assert blocks["block-1"]["text"] == "text 1"
+    assert temp_db.get_frames_bulk([]) == {}
+
+
+def test_ping(temp_db):
+    """Test ping confirms the connection is usable."""
+    assert temp_db.ping()
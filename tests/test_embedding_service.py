@@ -0,0 +1,94 @@
+"""Tests for the embedding service's background indexing pipeline."""
+
+import importlib.util
+
+import numpy as np
+import pytest
+
+from src.second_brain.embeddings.embedding_service import EmbeddingService
+
+
+class FakeModel:
+    """SentenceTransformer stand-in returning fixed unit vectors."""
+
+    def encode(self, texts, **kwargs):
+        return np.full((len(texts), 4), 0.5, dtype=np.float32)
+
+
+class FakeCollection:
+    """Chroma collection stand-in keeping rows in a dict."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        for row_id, metadata in zip(ids, metadatas):
+            self.rows[row_id] = metadata
+
+    def delete(self, where):
+        for row_id, metadata in list(self.rows.items()):
+            if metadata["frame_id"] == where["frame_id"]:
+                del self.rows[row_id]
+
+
+@pytest.fixture
+def service(config, monkeypatch):
+    """Create a service on a fake model and collection."""
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: object())
+    # Only flush() or a full batch should trigger a write
+    config.set("embeddings.write_interval_seconds", 60)
+    service = EmbeddingService(config)
+    service._sbert_model = FakeModel()
+    service._collection = FakeCollection()
+    yield service
+    service.close()
+
+
+def index_frame(service, frame_id):
+    """Index one frame with a single text block."""
+    service.index_text_blocks(
+        {"frame_id": frame_id, "timestamp": 1700000000},
+        [{"block_id": f"b{frame_id}", "text": f"text of frame {frame_id}"}],
+    )
+
+
+def test_flush_stores_queued_rows(service):
+    """Test flush() returns only once queued rows are in the collection."""
+    index_frame(service, 1)
+    index_frame(service, 2)
+
+    service.flush()
+
+    assert set(service.collection.rows) == {"1:b1", "2:b2"}
+
+
+def test_delete_after_enqueue_removes_rows(service):
+    """Test a delete isn't overtaken by rows still queued for the frame."""
+    index_frame(service, 1)
+    index_frame(service, 2)
+
+    service.delete_frame_blocks(1)
+    service.flush()
+
+    assert set(service.collection.rows) == {"2:b2"}
+
+
+def test_index_after_close_raises(service):
+    """Test indexing into a closed service fails instead of being dropped."""
+    index_frame(service, 1)
+    service.close()
+
+    assert set(service.collection.rows) == {"1:b1"}
+    with pytest.raises(RuntimeError):
+        index_frame(service, 2)
+
+
+def test_backlog_is_encoded_inline(service):
+    """Test the caller encodes the queue itself once it hits the high-water mark."""
+    service._max_pending = 2
+    index_frame(service, 1)
+    index_frame(service, 2)
+
+    assert service._pending_count == 0
+    service._encoded.join()
+    assert set(service.collection.rows) == {"1:b1", "2:b2"}